@@ -20,6 +20,13 @@ import common.utils
 
 from illogic.common.Prefs import *
 from illogic.asset_loader.Standin import *
+from illogic.asset_loader.StandinTableModel import StandinTableModel
+from illogic.asset_loader.standin_scene import list_standins
+from illogic.asset_loader.StandinRegistry import StandinRegistry
+from illogic.asset_loader.BulkJob import BulkJob
+from illogic.asset_loader.StandinConverter import StandinConverter
+from illogic.asset_loader.StandinChecker import StandinChecker
+from illogic.asset_loader.lod_budget import *
 
 import maya.OpenMaya as OpenMaya
 
@@ -27,6 +34,16 @@ import maya.OpenMaya as OpenMaya
 
 _FILE_NAME_PREFS = "asset_loader"
 
+# Delay without selection change before the standins are retrieved (a marquee drag sends many selection changes)
+_SELECTION_DEBOUNCE_MS = 80
+
+# Delay during which the standins checked in background are gathered before updating the table
+_CHECKED_FLUSH_MS = 100
+
+_BYTES_PER_GB = 1024 ** 3
+
+_ALWAYS_VISIBLE_TIERS = ("SD", "HD")
+
 
 # ######################################################################################################################
 
@@ -45,9 +62,30 @@ class AssetLoader(QtWidgets.QDialog):
 
         # Model attributes
         self.__standins = {}
+        self.__known_standins = {}
+        self.__standin_registry = StandinRegistry()
+        self.__standin_registry.start()
         self.__sel_standins = []
         self.__variants_and_versions_enabled = False
         self.__standing_table_refresh_select = True
+        # Bulk operation running, the scene selection is only applied once it is done
+        self.__bulk_job = None
+        # Up to date checks in background
+        self.__from_selection = False
+        self.__checked_standins = []
+        self.__nb_checks_remaining = 0
+        # Variants and versions displayed in the lists
+        self.__displayed_versions = None
+        # Standin handles of which the dso or the name changed since the last retrieval
+        self.__changed_handles = set()
+        # Whether the scene selection changed since the last retrieval, the rows are all selected again only then
+        self.__scene_selection_dirty = False
+        self.__standin_checker = StandinChecker(parent=self)
+        self.__standin_checker.checked.connect(self.__on_standins_checked)
+        self.__checked_timer = QTimer(self)
+        self.__checked_timer.setSingleShot(True)
+        self.__checked_timer.setInterval(_CHECKED_FLUSH_MS)
+        self.__checked_timer.timeout.connect(self.__apply_checked_standins)
 
         # UI attributes
         self.__ui_width = 850
@@ -55,6 +93,9 @@ class AssetLoader(QtWidgets.QDialog):
         self.__ui_min_width = 600
         self.__ui_min_height = 300
         self.__ui_pos = QDesktopWidget().availableGeometry().center() - QPoint(self.__ui_width,self.__ui_height)/2
+        self.__convert_instancing = True
+        self.__budget = 32.0
+        self.__budget_order = ORDER_LARGEST_FIRST
 
         self.__retrieve_prefs()
 
@@ -79,10 +120,14 @@ class AssetLoader(QtWidgets.QDialog):
         Save preferences
         :return:
         """
-        size = self.size()
-        self.__prefs["window_size"] = {"width": size.width(), "height": size.height()}
-        pos = self.pos()
-        self.__prefs["window_pos"] = {"x": pos.x(), "y": pos.y()}
+        with self.__prefs.batch():
+            size = self.size()
+            self.__prefs["window_size"] = {"width": size.width(), "height": size.height()}
+            pos = self.pos()
+            self.__prefs["window_pos"] = {"x": pos.x(), "y": pos.y()}
+            self.__prefs["convert_instancing"] = self.__ui_instancing_cb.isChecked()
+            self.__prefs["budget"] = {"size": self.__ui_budget_spin.value(),
+                                      "order": self.__ui_budget_order_cb.currentText()}
 
     def __retrieve_prefs(self):
         """
@@ -98,13 +143,26 @@ class AssetLoader(QtWidgets.QDialog):
             pos = self.__prefs["window_pos"]
             self.__ui_pos = QPoint(pos["x"],pos["y"])
 
+        if "convert_instancing" in self.__prefs:
+            self.__convert_instancing = self.__prefs["convert_instancing"]
+
+        if "budget" in self.__prefs:
+            budget = self.__prefs["budget"]
+            self.__budget = budget["size"]
+            self.__budget_order = budget["order"]
+
     def __create_callback(self):
         """
         Create callbacks
         :return:
         """
+        self.__selection_timer = QTimer(self)
+        self.__selection_timer.setSingleShot(True)
+        self.__selection_timer.setInterval(_SELECTION_DEBOUNCE_MS)
+        self.__selection_timer.timeout.connect(self.__apply_scene_selection)
         self.__selection_callback = \
             OpenMaya.MEventMessage.addEventCallback("SelectionChanged", self.__scene_selection_changed)
+        self.__standin_registry.subscribe(self.__scene_standins_changed)
 
     def hideEvent(self, arg__1: QtGui.QCloseEvent) -> None:
         """
@@ -112,16 +170,59 @@ class AssetLoader(QtWidgets.QDialog):
         :return:
         """
         OpenMaya.MMessage.removeCallback(self.__selection_callback)
+        self.__standin_registry.unsubscribe(self.__scene_standins_changed)
+        self.__standin_registry.stop()
+        self.__selection_timer.stop()
+        self.__standin_checker.stop()
+        self.__checked_timer.stop()
         self.__save_prefs()
 
     def __scene_selection_changed(self, *args, **kwargs):
         """
-        On scene changed we want to retrieve the standins selected and refresh the ui
+        On scene changed we wait for the selection to settle before retrieving the standins
         :return:
         """
-        self.__retrieve_standins()
-        self.__refresh_standin_table()
-        self.__select_all_standin()
+        self.__scene_selection_dirty = True
+        self.__selection_timer.start()
+
+    def __scene_standins_changed(self, added, removed, changed):
+        """
+        On standins added, removed or edited in the scene we retrieve the standins like on a selection change
+        :param added: standin handles added
+        :param removed: standin handles removed
+        :param changed: standin handles of which the dso or the name changed
+        :return:
+        """
+        self.__changed_handles.update(changed)
+        self.__selection_timer.start()
+
+    def __apply_scene_selection(self):
+        """
+        Retrieve the standins selected and only update the rows of the standins added or removed
+        :return:
+        """
+        if self.__bulk_job is not None: return
+        # Display the standins already checked before retrieving the new ones
+        if len(self.__checked_standins) > 0:
+            self.__checked_timer.stop()
+            self.__apply_checked_standins()
+        removed_names, added_names = self.__retrieve_standins()
+        # The checks of the previous selection are dropped
+        self.__refresh_checking_label()
+        self.__update_standin_table(removed_names, added_names)
+        # The rows kept of the standins renamed display their new object name
+        changed_handles = self.__changed_handles
+        self.__changed_handles = set()
+        if len(changed_handles) > 0:
+            standing_table_refresh_select_prev = self.__standing_table_refresh_select
+            self.__standing_table_refresh_select = False
+            self.__standin_model.refresh_rows([standin for standin in self.__standins.values()
+                                               if standin.get_node() in changed_handles])
+            self.__standing_table_refresh_select = standing_table_refresh_select_prev
+        # The changes of the scene (ex : made by the tool) keep the rows selected
+        if self.__scene_selection_dirty:
+            self.__scene_selection_dirty = False
+            self.__select_all_standin()
         self.__on_standin_select_changed()
 
     @staticmethod
@@ -139,40 +240,94 @@ class AssetLoader(QtWidgets.QDialog):
 
     def __retrieve_standins(self):
         """
-        Retrieve the standins
+        Retrieve the standins, only the ones that weren't retrieved before are parsed. The standins are checked in
+        background, when nothing is selected the out of date ones are added once they have been checked
+        :return: names of the standins removed, names of the standins added
+        """
+        # Enumerate through the API, the PyNodes are only created for the standins edited
+        standin_handles, from_selection = list_standins(self.__standin_registry)
+        standin_nodes = {standin_handle.get_name(): standin_handle for standin_handle in standin_handles}
+
+        # Parse the paths of the new standins, their publish directories are listed in background
+        known_standins = {}
+        for name, standin_node in standin_nodes.items():
+            standin_inst = self.__known_standins.get(name)
+            if standin_inst is None or not standin_inst.is_same(standin_node):
+                standin_inst = Standin(standin_node, lazy=True)
+            known_standins[name] = standin_inst
+        self.__known_standins = known_standins
+        self.__from_selection = from_selection
+        self.__nb_checks_remaining = self.__standin_checker.check(known_standins.values())
+
+        previous_standins = self.__standins
+        self.__standins = {}
+        for name, standin_inst in sorted(known_standins.items()):
+            if standin_inst.is_valid() and \
+                    (from_selection or (standin_inst.is_resolved() and not standin_inst.is_up_to_date())):
+                self.__standins[name] = standin_inst
+
+        removed_names = [name for name, standin_inst in previous_standins.items()
+                         if self.__standins.get(name) is not standin_inst]
+        added_names = [name for name, standin_inst in self.__standins.items()
+                       if previous_standins.get(name) is not standin_inst]
+        return removed_names, added_names
+
+    def __on_standins_checked(self, generation, standins):
+        """
+        Gather the standins checked in background, the table is updated a bit later for all of them at once
+        :param generation: generation of the check
+        :param standins: standins resolved
         :return:
         """
-        self.__standins.clear()
-
-        selection = pm.ls(selection=True)
-        if len(selection)>0:
-            standins = {}
-            for sel in selection:
-                if pm.objectType(sel, isType="aiStandIn"):
-                    # Standin found
-                    standins[sel.name()] = Standin(sel)
-                elif pm.objectType(sel, isType="transform"):
-                    prt = sel.getParent()
-                    if prt is not None and pm.objectType(prt, isType="transform"):
-                        shape = prt.getShape()
-                        if shape is not None and pm.objectType(shape, isType="aiStandIn"):
-                            # Proxy of Standin found
-                            standins[shape.name()] = Standin(shape)
-
-                for rel in pm.listRelatives(sel, allDescendents=True, type="aiStandIn"):
-                    standins[rel.name()] = Standin(rel)
-
-            for name, standin in standins.items():
-                if standin.is_valid():
+        if generation != self.__standin_checker.get_generation(): return
+        self.__checked_standins.extend(standins)
+        if not self.__checked_timer.isActive():
+            self.__checked_timer.start()
+
+    def __apply_checked_standins(self):
+        """
+        Display the status of the standins checked since the last time
+        :return:
+        """
+        checked_standins = self.__checked_standins
+        self.__checked_standins = []
+        self.__nb_checks_remaining = max(0, self.__nb_checks_remaining - len(checked_standins))
+        # The rows already displayed show the new versions published
+        standing_table_refresh_select_prev = self.__standing_table_refresh_select
+        self.__standing_table_refresh_select = False
+        self.__standin_model.refresh_rows(checked_standins)
+        self.__standing_table_refresh_select = standing_table_refresh_select_prev
+        if not self.__from_selection:
+            added_names = []
+            for standin in checked_standins:
+                name = standin.get_node().get_name()
+                if self.__known_standins.get(name) is standin and name not in self.__standins \
+                        and standin.is_resolved() and not standin.is_up_to_date():
                     self.__standins[name] = standin
-        else:
-            standins = pm.ls(type="aiStandIn")
-            for standin in standins:
-                standin_inst = Standin(standin)
-                if standin_inst.is_valid() and not standin_inst.is_up_to_date():
-                    self.__standins[standin.name()] = standin_inst
+                    added_names.append(name)
+            self.__update_standin_table([], added_names)
+
+        # The variants and versions of the standins selected are displayed once they are checked, and displayed
+        # again only if new ones have been published
+        checked_standins = set(checked_standins)
+        if any(standin in checked_standins for standin in self.__sel_standins):
+            if not self.__variants_and_versions_enabled or \
+                    self.__sel_standins[0].get_versions() is not self.__displayed_versions:
+                self.__check_variants_versions_enabled()
+                self.__refresh_variants_list()
+                self.__refresh_versions_list()
+            self.__refresh_btn()
+        self.__refresh_checking_label()
 
-        self.__standins = dict(sorted(self.__standins.items()))
+    def __refresh_checking_label(self):
+        """
+        Refresh the title of the standins table with the number of standins still being checked
+        :return:
+        """
+        if self.__nb_checks_remaining > 0:
+            self.__ui_standins_title.setText("Standins in Scene (checking... %d remaining)" % self.__nb_checks_remaining)
+        else:
+            self.__ui_standins_title.setText("Standins in Scene")
 
     def __create_ui(self):
         """
@@ -197,24 +352,28 @@ class AssetLoader(QtWidgets.QDialog):
         main_lyt.addLayout(top_grid_layout)
 
         # ML.1.1 : Left title
-        left_title = QLabel("Standins in Scene")
-        left_title.setAlignment(Qt.AlignCenter)
-        top_grid_layout.addWidget(left_title, 0, 0)
+        self.__ui_standins_title = QLabel("Standins in Scene")
+        self.__ui_standins_title.setAlignment(Qt.AlignCenter)
+        top_grid_layout.addWidget(self.__ui_standins_title, 0, 0)
         # ML.1.2 : Right title
         right_title = QLabel("Variant - Version")
         right_title.setAlignment(Qt.AlignCenter)
         top_grid_layout.addWidget(right_title, 0, 1)
 
         # ML.1.3 : Table Standins
-        self.__ui_standin_table = QTableWidget(0, 4)
-        self.__ui_standin_table.setHorizontalHeaderLabels(["Name", "Asset", "Variant", "Version"])
+        self.__standin_model = StandinTableModel(self.__asset_path, self)
+        self.__standin_model.set_standins(self.__standins)
+        self.__ui_standin_table = QTableView()
+        self.__ui_standin_table.setModel(self.__standin_model)
+        self.__ui_standin_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.__ui_standin_table.setSortingEnabled(True)
         self.__ui_standin_table.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Preferred)
         self.__ui_standin_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.__ui_standin_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.__ui_standin_table.verticalHeader().hide()
         self.__ui_standin_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.__ui_standin_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.__ui_standin_table.itemSelectionChanged.connect(self.__on_standin_select_changed)
+        self.__ui_standin_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.__ui_standin_table.selectionModel().selectionChanged.connect(self.__on_standin_select_changed)
         top_grid_layout.addWidget(self.__ui_standin_table, 1, 0)
         # ML.1.4 : Content Right layout
         content_right_layout = QVBoxLayout()
@@ -256,14 +415,14 @@ class AssetLoader(QtWidgets.QDialog):
         # ML.1.6 : Buttons right layout
         btn_right_lyt = QHBoxLayout()
         top_grid_layout.addLayout(btn_right_lyt, 2, 1)
-        # ML.1.6.1 : To SD Button
-        self.__ui_to_sd_btn = QPushButton("to SD")
-        self.__ui_to_sd_btn.clicked.connect(self.__set_to_sd)
-        btn_right_lyt.addWidget(self.__ui_to_sd_btn)
-        # ML.1.6.2 : To HD Button
-        self.__ui_to_hd_btn = QPushButton("to HD")
-        self.__ui_to_hd_btn.clicked.connect(self.__set_to_hd)
-        btn_right_lyt.addWidget(self.__ui_to_hd_btn)
+        # ML.1.6.1 : To tier Buttons, only SD and HD are always displayed
+        self.__ui_to_tier_btns = {}
+        for tier in get_lod_tiers():
+            to_tier_btn = QPushButton("to " + tier)
+            to_tier_btn.clicked.connect(partial(self.__set_to_tier, tier))
+            to_tier_btn.setVisible(tier in _ALWAYS_VISIBLE_TIERS)
+            btn_right_lyt.addWidget(to_tier_btn)
+            self.__ui_to_tier_btns[tier] = to_tier_btn
 
         # ML.2 : Separator
         sep = QFrame()
@@ -281,18 +440,47 @@ class AssetLoader(QtWidgets.QDialog):
         self.__ui_to_maya_btn.setFixedWidth(180)
         self.__ui_to_maya_btn.clicked.connect(self.__convert_to_maya)
         bottom_btn_lyt.addWidget(self.__ui_to_maya_btn)
-        # ML.3.2 : Add transforms
+        # ML.3.2 : Instancing checkbox
+        self.__ui_instancing_cb = QCheckBox("Instances")
+        self.__ui_instancing_cb.setToolTip("Standins of the same file become instances of a single reference")
+        self.__ui_instancing_cb.setChecked(self.__convert_instancing)
+        bottom_btn_lyt.addWidget(self.__ui_instancing_cb)
+        # ML.3.3 : Add transforms
         self.__ui_add_transforms = QPushButton("Add Transforms")
         self.__ui_add_transforms.setFixedWidth(180)
         self.__ui_add_transforms.setEnabled(False)  # TODO to implement
         bottom_btn_lyt.addWidget(self.__ui_add_transforms)
 
+        # ML.4 : Budget layout
+        budget_lyt = QHBoxLayout()
+        budget_lyt.setAlignment(Qt.AlignCenter)
+        main_lyt.addLayout(budget_lyt)
+        # ML.4.1 : Budget size
+        budget_lyt.addWidget(QLabel("Memory budget"))
+        self.__ui_budget_spin = QDoubleSpinBox()
+        self.__ui_budget_spin.setRange(0.1, 4096)
+        self.__ui_budget_spin.setDecimals(1)
+        self.__ui_budget_spin.setSuffix(" GB")
+        self.__ui_budget_spin.setValue(self.__budget)
+        budget_lyt.addWidget(self.__ui_budget_spin)
+        # ML.4.2 : Budget order
+        self.__ui_budget_order_cb = QComboBox()
+        self.__ui_budget_order_cb.addItems([ORDER_LARGEST_FIRST, ORDER_FARTHEST_FIRST])
+        self.__ui_budget_order_cb.setCurrentText(self.__budget_order)
+        budget_lyt.addWidget(self.__ui_budget_order_cb)
+        # ML.4.3 : Fit budget button
+        self.__ui_fit_budget_btn = QPushButton("Fit budget")
+        self.__ui_fit_budget_btn.setToolTip("Switch HD standins of the scene to SD until the .ass files fit the budget")
+        self.__ui_fit_budget_btn.clicked.connect(self.__fit_budget)
+        budget_lyt.addWidget(self.__ui_fit_budget_btn)
+
     def __refresh_ui(self):
         """
         Refresh the ui according to the model attribute
         :return:
         """
         self.__refresh_standin_table()
+        self.__refresh_checking_label()
         self.__check_variants_versions_enabled()
         self.__refresh_variants_list()
         self.__refresh_versions_list()
@@ -314,6 +502,9 @@ class AssetLoader(QtWidgets.QDialog):
         standin_curr = None
         for standin in self.__sel_standins:
             if standin_curr is None:
+                # The variants and versions are only displayed once they have been checked
+                if not standin.is_resolved():
+                    break
                 standin_curr = standin
                 self.__variants_and_versions_enabled = True
 
@@ -325,55 +516,25 @@ class AssetLoader(QtWidgets.QDialog):
 
     def __refresh_standin_table(self):
         """
-        Refresh the standins table and their data
+        Refresh the standins table and their data, only the rows that changed are repainted
         :return:
         """
         standing_table_refresh_select_prev = self.__standing_table_refresh_select
         self.__standing_table_refresh_select = False
-        self.__ui_standin_table.setRowCount(0)
-        row_index = 0
-        rows_selected = []
-        for standin in self.__standins.values():
-            self.__ui_standin_table.insertRow(row_index)
-            object_name = standin.get_object_name()
-            standin_name = standin.get_standin_name()
-
-            if standin in self.__sel_standins:
-                rows_selected.append(row_index)
-
-            active_variant = standin.get_active_variant()
-            active_version = standin.get_active_version()
-
-            if standin.is_up_to_date():
-                version_str = active_version
-                asset_icon = self.__asset_path + "/valid.png"
-            else:
-                version_str = active_version + " -> " + standin.last_version()
-                asset_icon = self.__asset_path + "/warning.png"
-
-            object_name_item = QTableWidgetItem(object_name)
-            object_name_item.setIcon(QIcon(asset_icon))
-            object_name_item.setData(Qt.UserRole, standin)
-            self.__ui_standin_table.setItem(row_index, 0, object_name_item)
-
-            standin_name_item = QTableWidgetItem(standin_name)
-            standin_name_item.setTextAlignment(Qt.AlignCenter)
-            self.__ui_standin_table.setItem(row_index, 1, standin_name_item)
-
-            variant_item = QTableWidgetItem(active_variant)
-            variant_item.setTextAlignment(Qt.AlignCenter)
-            self.__ui_standin_table.setItem(row_index, 2, variant_item)
-
-            version_item = QTableWidgetItem(version_str)
-            version_item.setTextAlignment(Qt.AlignCenter)
-            self.__ui_standin_table.setItem(row_index, 3, version_item)
-            row_index += 1
-
-        self.__ui_standin_table.setSelectionMode(QAbstractItemView.MultiSelection)
-        for row_index in rows_selected:
-            self.__ui_standin_table.selectRow(row_index)
-        self.__ui_standin_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.__standin_model.refresh_rows()
+        self.__standing_table_refresh_select = standing_table_refresh_select_prev
 
+    def __update_standin_table(self, removed_names, added_names):
+        """
+        Remove and insert only the rows of the standins given
+        :param removed_names: names of the standins removed
+        :param added_names: names of the standins added
+        :return:
+        """
+        standing_table_refresh_select_prev = self.__standing_table_refresh_select
+        self.__standing_table_refresh_select = False
+        self.__standin_model.remove_standins(removed_names)
+        self.__standin_model.add_standins({name: self.__standins[name] for name in added_names})
         self.__standing_table_refresh_select = standing_table_refresh_select_prev
 
     def __refresh_variants_list(self):
@@ -383,10 +544,12 @@ class AssetLoader(QtWidgets.QDialog):
         """
         self.__ui_variant_list.clear()
         self.__ui_variant_list.setEnabled(self.__variants_and_versions_enabled)
+        self.__displayed_versions = None
         if self.__variants_and_versions_enabled:
             standin = self.__sel_standins[0]
             active_variant = standin.get_active_variant()
             var_vers = standin.get_versions()
+            self.__displayed_versions = var_vers
             for variant in var_vers.keys():
                 variant_list_widget = QListWidgetItem(variant)
                 self.__ui_variant_list.addItem(variant_list_widget)
@@ -412,9 +575,9 @@ class AssetLoader(QtWidgets.QDialog):
             versions_active_variant = variants_and_versions[selected_variant]
             active_version = standin.get_active_version()
             for version in versions_active_variant:
-                version_list_widget = QListWidgetItem(version[0])
+                version_list_widget = QListWidgetItem(version)
                 self.__ui_version_list.addItem(version_list_widget)
-                if active_variant == selected_variant and active_version == version[0]:
+                if active_variant == selected_variant and active_version == version:
                     self.__ui_version_list.setItemSelected(version_list_widget, True)
                     version_list_widget.setTextColor(QColor(0, 255, 255).rgba())
 
@@ -432,17 +595,15 @@ class AssetLoader(QtWidgets.QDialog):
             variant = variant_items[0].text()
             version = version_items[0].text()
 
-        has_sd = False
-        has_hd = False
+        available_tiers = set()
         up_to_date = False
         set_version = False
         for standin in self.__sel_standins:
+            if not standin.is_resolved():
+                continue
             if not standin.is_up_to_date():
                 up_to_date = True
-            if standin.has_version_in_sd():
-                has_sd = True
-            if standin.has_version_in_hd():
-                has_hd = True
+            available_tiers.update(standin.get_available_tiers().keys())
             if standin.get_active_version() != version or standin.get_active_variant() != variant:
                 set_version = True
 
@@ -450,8 +611,10 @@ class AssetLoader(QtWidgets.QDialog):
         self.__ui_submit_version_btn.setEnabled(self.__variants_and_versions_enabled and set_version and
                                                 len(version_items) > 0)
 
-        self.__ui_to_sd_btn.setEnabled(has_sd)
-        self.__ui_to_hd_btn.setEnabled(has_hd)
+        for tier, to_tier_btn in self.__ui_to_tier_btns.items():
+            available = tier in available_tiers
+            to_tier_btn.setEnabled(available)
+            to_tier_btn.setVisible(available or tier in _ALWAYS_VISIBLE_TIERS)
 
         self.__ui_to_maya_btn.setEnabled(many_sel_standin)
 
@@ -463,7 +626,7 @@ class AssetLoader(QtWidgets.QDialog):
         if self.__standing_table_refresh_select:
             self.__sel_standins.clear()
             for s in self.__ui_standin_table.selectionModel().selectedRows():
-                self.__sel_standins.append(self.__ui_standin_table.item(s.row(), 0).data(Qt.UserRole))
+                self.__sel_standins.append(self.__standin_model.get_standin(s.row()))
             self.__check_variants_versions_enabled()
             self.__refresh_variants_list()
             self.__refresh_versions_list()
@@ -482,13 +645,13 @@ class AssetLoader(QtWidgets.QDialog):
         Select all the standins that are out of dates
         :return:
         """
-        self.__ui_standin_table.clearSelection()
-        self.__ui_standin_table.setSelectionMode(QAbstractItemView.MultiSelection)
-        for i in range(self.__ui_standin_table.rowCount()):
-            standin = self.__ui_standin_table.item(i, 0).data(Qt.UserRole)
-            if not standin.is_up_to_date():
-                self.__ui_standin_table.selectRow(i)
-        self.__ui_standin_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        selection = QItemSelection()
+        for i in range(self.__standin_model.rowCount()):
+            if not self.__standin_model.is_up_to_date(i) and not self.__standin_model.is_checking(i) \
+                    and not self.__standin_model.is_failed(i):
+                selection.select(self.__standin_model.index(i, 0), self.__standin_model.index(i, 0))
+        self.__ui_standin_table.selectionModel().select(
+            selection, QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
 
     def __set_version(self):
         """
@@ -499,47 +662,105 @@ class AssetLoader(QtWidgets.QDialog):
         version_items = self.__ui_version_list.selectedItems()
         variant_items = self.__ui_variant_list.selectedItems()
         if len(variant_items) > 0 and len(version_items) > 0:
-            version_item = version_items[0]
-            variant_item = variant_items[0]
-            for standin in self.__sel_standins:
-                standin.set_active_variant_version(variant_item.text(), version_item.text())
-            self.__refresh_ui()
+            variant = variant_items[0].text()
+            version = version_items[0].text()
+            self.__run_bulk_job("Set version", lambda standins: Standin.set_variants_versions(
+                [(standin, variant, version) for standin in standins], undo_chunk=False))
 
     def __update_to_last(self):
         """
         Update all the standins selected versions to the last of their variant
         :return:
         """
-        for standin in self.__sel_standins:
-            standin.update_to_last()
-        self.__refresh_ui()
+        self.__run_bulk_job("Update to last",
+                            lambda standins: Standin.update_all_to_last(standins, undo_chunk=False))
 
-    def __set_to_sd(self):
+    def __set_to_tier(self, tier):
         """
-        Set to an SD variant
+        Set the standins selected to the variant of a LOD tier
+        :param tier
         :return:
         """
-        for standin in self.__sel_standins:
-            standin.set_to_sd()
-        self.__refresh_ui()
+        self.__run_bulk_job("Set to " + tier,
+                            lambda standins: Standin.set_all_to_tier(standins, tier, undo_chunk=False))
 
-    def __set_to_hd(self):
+    def __convert_to_maya(self):
         """
-        Set to an HD variant
+        Convert the standins selected to Maya object
         :return:
         """
-        for standin in self.__sel_standins:
-            standin.set_to_hd()
-        self.__refresh_ui()
+        # Each Maya file is referenced once for the whole operation
+        converter = StandinConverter(instancing=self.__ui_instancing_cb.isChecked())
+        self.__standing_table_refresh_select = False
+        self.__run_bulk_job("Convert to Maya", converter.convert, converter.print_timings)
 
-    def __convert_to_maya(self):
+    def __fit_budget(self):
         """
-        Convert the standins selected to Maya object
+        Propose to switch standins of the scene from HD to SD so that their .ass files fit the budget
         :return:
         """
-        self.__standing_table_refresh_select = False
-        standins = self.__sel_standins
-        for standin in standins:
-            standin.convert_to_maya()
+        # All the standins of the scene, not only the ones selected
+        standins = []
+        for standin_node in self.__standin_registry.get_standins():
+            standin = self.__known_standins.get(standin_node.get_name())
+            if standin is None or not standin.is_same(standin_node):
+                standin = Standin(standin_node, lazy=True)
+            if standin.is_valid():
+                standins.append(standin)
+        Standin.resolve_all(standins)
+        budget = int(self.__ui_budget_spin.value() * _BYTES_PER_GB)
+        proposal = propose_sd_switches(standins, budget, self.__ui_budget_order_cb.currentText())
+        msg = "Standins : %.2f GB\nBudget : %.2f GB\n\n" % (proposal.scene_size / _BYTES_PER_GB,
+                                                            proposal.budget / _BYTES_PER_GB)
+        if len(proposal.switches) == 0:
+            QMessageBox.information(self, "Fit budget", msg + "No standin to switch to SD")
+            return
+        msg += "%d standins switched to SD : %.2f GB" % (len(proposal.switches),
+                                                         proposal.proposed_size / _BYTES_PER_GB)
+        if proposal.proposed_size > proposal.budget:
+            msg += " (no more SD variant available)"
+        if QMessageBox.question(self, "Fit budget", msg + "\n\nApply ?") == QMessageBox.Yes:
+            self.__run_bulk_job("Fit budget",
+                                lambda changes: Standin.set_variants_versions(changes, undo_chunk=False),
+                                items=proposal.switches)
+
+    def __run_bulk_job(self, title, process_chunk, on_finished=None, items=None):
+        """
+        Process the standins selected by chunks with a progress dialog, in a single undo chunk
+        :param title
+        :param process_chunk: function processing a list of standins
+        :param on_finished: function called once the operation is done or cancelled
+        :param items: items to process instead of the standins selected
+        :return:
+        """
+        if items is None:
+            items = self.__sel_standins
+        if self.__bulk_job is not None or len(items) == 0: return
+        self.__bulk_job = BulkJob(title, items, partial(self.__process_chunk, process_chunk), parent=self)
+        if on_finished is not None:
+            self.__bulk_job.finished.connect(lambda cancelled: on_finished())
+        self.__bulk_job.finished.connect(self.__on_bulk_job_finished)
+        self.__bulk_job.start()
+
+    def __process_chunk(self, process_chunk, items):
+        """
+        Process a chunk of a bulk operation, the dso written by the tool aren't notified back by the registry
+        :param process_chunk
+        :param items
+        :return: result of the chunk processing
+        """
+        with self.__standin_registry.ignore_changes():
+            return process_chunk(items)
+
+    def __on_bulk_job_finished(self, cancelled):
+        """
+        Refresh the UI once the bulk operation is done or cancelled
+        :param cancelled
+        :return:
+        """
+        self.__bulk_job.deleteLater()
+        self.__bulk_job = None
         self.__standing_table_refresh_select = True
         self.__refresh_ui()
+        # Apply the scene changes made during the operation
+        self.__selection_timer.start()
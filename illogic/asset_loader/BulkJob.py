@@ -0,0 +1,93 @@
+import time
+
+try:
+    import maya.cmds as cmds
+except:
+    # Maya not found
+    pass
+
+from PySide2.QtCore import *
+from PySide2.QtWidgets import *
+
+# ######################################################################################################################
+
+_CHUNK_SIZE = 100
+
+# ######################################################################################################################
+
+
+class BulkJob(QObject):
+    # Emitted at the end with whether the job has been cancelled
+    finished = Signal(bool)
+
+    def __init__(self, title, items, process_chunk, chunk_size=_CHUNK_SIZE, parent=None):
+        """
+        Constructor
+        :param title: title of the progress dialog
+        :param items: items to process
+        :param process_chunk: function processing a list of items
+        :param chunk_size: number of items processed between two repaints of the ui
+        :param parent
+        """
+        super(BulkJob, self).__init__(parent)
+        self.__title = title
+        self.__items = list(items)
+        self.__process_chunk = process_chunk
+        self.__chunk_size = chunk_size
+        self.__nb_done = 0
+        self.__start_time = None
+        self.__progress_dialog = None
+
+    def start(self):
+        """
+        Start the job, the chunks are processed from the Qt event loop so the ui repaints between them
+        :return:
+        """
+        self.__start_time = time.time()
+        # All the chunks are undone at once, the progress dialog is modal so nothing else gets in the chunk
+        cmds.undoInfo(openChunk=True, chunkName=self.__title)
+        self.__progress_dialog = QProgressDialog(self.__title, "Cancel", 0, len(self.__items), self.parent())
+        self.__progress_dialog.setWindowTitle(self.__title)
+        self.__progress_dialog.setWindowModality(Qt.ApplicationModal)
+        self.__progress_dialog.setMinimumDuration(0)
+        self.__progress_dialog.setValue(0)
+        QTimer.singleShot(0, self.__process_next_chunk)
+
+    def __process_next_chunk(self):
+        """
+        Process a chunk then schedule the next one
+        :return:
+        """
+        if self.__progress_dialog.wasCanceled():
+            self.__finish(True)
+            return
+
+        chunk = self.__items[self.__nb_done:self.__nb_done + self.__chunk_size]
+        try:
+            self.__process_chunk(chunk)
+        except Exception:
+            self.__finish(True)
+            raise
+        self.__nb_done += len(chunk)
+
+        nb_items = len(self.__items)
+        elapsed_time = time.time() - self.__start_time
+        remaining_time = elapsed_time / self.__nb_done * (nb_items - self.__nb_done) if self.__nb_done > 0 else 0
+        self.__progress_dialog.setLabelText("%s\n%d / %d - %ds left" %
+                                            (self.__title, self.__nb_done, nb_items, round(remaining_time)))
+        self.__progress_dialog.setValue(self.__nb_done)
+
+        if self.__nb_done >= nb_items:
+            self.__finish(False)
+        else:
+            QTimer.singleShot(0, self.__process_next_chunk)
+
+    def __finish(self, cancelled):
+        """
+        Close the undo chunk and the progress dialog
+        :param cancelled
+        :return:
+        """
+        cmds.undoInfo(closeChunk=True)
+        self.__progress_dialog.close()
+        self.finished.emit(cancelled)
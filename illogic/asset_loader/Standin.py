@@ -1,38 +1,122 @@
 import os
-import re
-import pymel.core as pm
-from common.standin_utils import *
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import maya.cmds as cmds
+except:
+    # Maya not found
+    pass
+
+from illogic.common.standin_utils import *
+from illogic.asset_loader.StandinHandle import StandinHandle
+from illogic.asset_loader.StandinConverter import StandinConverter
+
+# ######################################################################################################################
+
+_FILE_CHECK_WORKERS = 16
+
+# ######################################################################################################################
+
 
 class Standin:
-    def __init__(self, standin):
+    # Standins are created by thousands, they only keep references to strings and to the version table of their asset
+    # shared by the publish index
+    __slots__ = ("__standin", "__node", "__object_name", "__dso", "__standin_name", "__publish_ass_dir", "__versions",
+                 "__active_variant", "__active_version", "__parse_valid", "__check_failed")
+
+    def __init__(self, standin, lazy=False):
         """
         Constructor
-        :param standin
+        :param standin: PyNode or StandinHandle of the aiStandIn
+        :param lazy: whether the variants and versions are only listed when they are needed
         """
         self.__standin = standin
+        self.__node = None if isinstance(standin, StandinHandle) else standin
         self.__object_name = ""
+        self.__dso = ""
         self.__standin_name = ""
+        self.__publish_ass_dir = None
         self.__versions = {}
         self.__active_variant = ""
         self.__active_version = None
         self.__parse_valid = False
-        self.__parse()
+        self.__check_failed = False
+        self.__parse(lazy)
 
-    def __parse(self):
+    def __parse(self, lazy):
         """
         Retrieve all the datas of the standin
+        :param lazy: whether the variants and versions are retrieved later
         :return:
         """
-        # Use the parse_standin function in common package (Illogic package)
-        parsed_data = parse_standin(self.__standin)
-        self.__object_name = parsed_data["object_name"]
-        self.__parse_valid = parsed_data["valid"]
+        # Use the parse_standin_path function in common package (Illogic package)
+        if self.__node is None:
+            self.__dso = self.__standin.get_dso()
+        else:
+            self.__object_name = self.__node.getParent().name()
+            self.__dso = self.__node.dso.get()
+        standin_path = parse_standin_path(self.__dso)
+        self.__parse_valid = standin_path is not None
         if self.__parse_valid:
-            self.__standin_name = parsed_data["standin_name"]
-            self.__publish_ass_dir = parsed_data["publish_ass_dir"]
-            self.__active_variant = parsed_data["active_variant"]
-            self.__active_version = parsed_data["active_version"]
-            self.__versions = parsed_data["standin_versions"]
+            self.__standin_name = standin_path.standin_name
+            self.__publish_ass_dir = standin_path.publish_ass_dir
+            self.__active_variant = standin_path.active_variant
+            self.__active_version = standin_path.active_version
+            self.__versions = None
+            if not lazy:
+                self.resolve()
+
+    def resolve(self):
+        """
+        Retrieve the variants and versions if it hasn't been done yet
+        :return: variants and versions
+        """
+        if self.__versions is None:
+            self.__versions = get_standin_versions(self.__publish_ass_dir)
+        return self.__versions
+
+    def refresh(self):
+        """
+        Retrieve again the variants and versions, the publish index only lists the directories that changed
+        :return: variants and versions
+        """
+        if self.__parse_valid:
+            self.__versions = get_standin_versions(self.__publish_ass_dir)
+        return self.__versions
+
+    def is_check_failed(self):
+        """
+        Getter of whether the publish directory couldn't be listed at the last check
+        :return: is check failed
+        """
+        return self.__check_failed
+
+    def set_check_failed(self, check_failed):
+        """
+        Setter of whether the publish directory couldn't be listed at the last check
+        :param check_failed
+        :return:
+        """
+        self.__check_failed = check_failed
+
+    def is_resolved(self):
+        """
+        Getter of whether the variants and versions have been retrieved
+        :return: is resolved
+        """
+        return self.__versions is not None
+
+    @staticmethod
+    def resolve_all(standins):
+        """
+        Retrieve the variants and versions of many standins, listing their publish directories in parallel.
+        Only does file I/O so it can run in a background thread
+        :param standins
+        :return:
+        """
+        standins = [standin for standin in standins if standin.is_valid() and not standin.is_resolved()]
+        prefetch_publish_dirs([standin.get_publish_ass_dir() for standin in standins])
+        for standin in standins:
+            standin.resolve()
 
     def is_valid(self):
         """
@@ -41,11 +125,37 @@ class Standin:
         """
         return self.__parse_valid
 
+    def get_node(self):
+        """
+        Getter of the standin node as it was given (PyNode or StandinHandle)
+        :return: standin node
+        """
+        return self.__standin
+
+    def is_same(self, standin_node):
+        """
+        Getter of whether a standin handle listed is the node of this standin with the dso it has now
+        :param standin_node: StandinHandle
+        :return: is same
+        """
+        return self.__standin == standin_node and self.__dso == standin_node.get_dso()
+
+    def get_node_path(self):
+        """
+        Get the full path of the standin node without creating its PyNode
+        :return: full path
+        """
+        if self.__node is None:
+            return self.__standin.get_full_path()
+        return self.__node.longName()
+
     def get_object_name(self):
         """
-        Getter of object name
+        Getter of object name, read from the node when the standin comes from a StandinHandle
         :return: object name
         """
+        if isinstance(self.__standin, StandinHandle):
+            return self.__standin.get_object_name()
         return self.__object_name
 
     def get_standin_name(self):
@@ -55,6 +165,13 @@ class Standin:
         """
         return self.__standin_name
 
+    def get_publish_ass_dir(self):
+        """
+        Getter of the publish directory of the asset
+        :return: publish directory
+        """
+        return self.__publish_ass_dir
+
     def get_active_variant(self):
         """
         Getter of the active variant
@@ -72,16 +189,25 @@ class Standin:
     def get_versions(self):
         """
         Getter of the variants and versions
-        :return: variants and versions
+        :return: read-only variants and versions (sorted from newest to oldest) shared by the standins of the asset
         """
-        return self.__versions
+        return self.resolve()
+
+    def get_version_dir(self, variant, version):
+        """
+        Get the directory of a version
+        :param variant
+        :param version
+        :return: version directory
+        """
+        return get_version_dir(self.__publish_ass_dir, self.__standin_name, variant, version)
 
     def last_version(self):
         """
         Get the last version
         :return: last version
         """
-        return self.__versions[self.__active_variant][0][0]
+        return self.resolve()[self.__active_variant][0]
 
     def is_up_to_date(self):
         """
@@ -97,14 +223,53 @@ class Standin:
         :param version
         :return:
         """
-        if self.__active_variant != variant or self.__active_version != version:
-            if len(variant) > 0 and len(version) > 0:
-                version_file = self.__publish_ass_dir + "/" + self.__standin_name + "_" + variant + "/" + version + "/" + \
-                               self.__standin_name + "_" + variant + ".ass"
-                if os.path.isfile(version_file):
-                    self.__standin.dso.set(version_file)
-                    self.__active_variant = variant
-                    self.__active_version = version
+        Standin.set_variants_versions([(self, variant, version)], undo_chunk=False)
+
+    @staticmethod
+    def set_variants_versions(changes, undo_chunk=True):
+        """
+        Set new variants and versions to many standins at once. Each target file is checked once (in parallel) and
+        all the dso are written in a single pass
+        :param changes: list of (standin, variant, version)
+        :param undo_chunk: whether the dso are written in their own undo chunk
+        :return: standins changed
+        """
+        # Group the standins by target file
+        standins_by_file = {}
+        for standin, variant, version in changes:
+            if variant is None or version is None or len(variant) == 0 or len(version) == 0:
+                continue
+            if standin.__active_variant == variant and standin.__active_version == version:
+                continue
+            version_file = get_version_file(standin.__publish_ass_dir, standin.__standin_name, variant, version)
+            standins_by_file.setdefault(version_file, []).append((standin, variant, version))
+        if len(standins_by_file) == 0:
+            return []
+
+        version_files = list(standins_by_file.keys())
+        if len(version_files) == 1:
+            files_exist = [os.path.isfile(version_files[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(_FILE_CHECK_WORKERS, len(version_files))) as executor:
+                files_exist = list(executor.map(os.path.isfile, version_files))
+
+        standins_changed = []
+        if undo_chunk:
+            cmds.undoInfo(openChunk=True, chunkName="Asset Loader : set versions")
+        try:
+            for version_file, file_exists in zip(version_files, files_exist):
+                if not file_exists:
+                    continue
+                for standin, variant, version in standins_by_file[version_file]:
+                    cmds.setAttr(standin.get_node_path() + ".dso", version_file, type="string")
+                    standin.__dso = version_file
+                    standin.__active_variant = variant
+                    standin.__active_version = version
+                    standins_changed.append(standin)
+        finally:
+            if undo_chunk:
+                cmds.undoInfo(closeChunk=True)
+        return standins_changed
 
     def update_to_last(self):
         """
@@ -113,74 +278,137 @@ class Standin:
         """
         self.set_active_variant_version(self.__active_variant, self.last_version())
 
+    @staticmethod
+    def update_all_to_last(standins, undo_chunk=True):
+        """
+        Update many standins to the last version of their current variant
+        :param standins
+        :param undo_chunk: whether the dso are written in their own undo chunk
+        :return: standins changed
+        """
+        return Standin.set_variants_versions(
+            [(standin, standin.__active_variant, standin.last_version()) for standin in standins], undo_chunk)
+
+    def __get_lod_tier_table(self):
+        """
+        Get the tier table of the variants and versions of the standin, shared by the standins of the asset
+        :return: LodTierTable
+        """
+        return get_lod_tier_table(self.__publish_ass_dir, self.resolve())
+
+    def get_tier(self):
+        """
+        Get the LOD tier of the active variant
+        :return: tier or None
+        """
+        if not self.__parse_valid:
+            return None
+        return self.__get_lod_tier_table().get_tier(self.__active_variant)
+
+    def get_tier_variant(self, tier):
+        """
+        Get the variant of another LOD tier that has the active version
+        :param tier
+        :return: variant or None if there is none or if the active variant is already in this tier
+        """
+        if not self.__parse_valid:
+            return None
+        return self.__get_lod_tier_table().get_variant(self.__active_variant, self.__active_version, tier)
+
+    def get_available_tiers(self):
+        """
+        Get the LOD tiers the standin can be switched to
+        :return: variant by tier
+        """
+        if not self.__parse_valid:
+            return {}
+        return self.__get_lod_tier_table().get_available_tiers(self.__active_variant, self.__active_version)
+
+    def get_sd_variant(self):
+        """
+        Get the SD variant corresponding to the active HD variant and version
+        :return: SD variant or None
+        """
+        return self.get_tier_variant("SD")
+
+    def get_hd_variant(self):
+        """
+        Get the HD variant corresponding to the active SD variant and version
+        :return: HD variant or None
+        """
+        return self.get_tier_variant("HD")
+
     def has_version_in_sd(self):
         """
         Getter of whether the standin active variant is a SD
         :return: has version in sd
         """
-        return self.__get_version_replaced("HD", "SD") is not None
+        return self.get_sd_variant() is not None
 
     def has_version_in_hd(self):
         """
         Getter of whether the standin active variant is a HD
         :return: has version in hd
         """
-        return self.__get_version_replaced("SD", "HD") is not None
+        return self.get_hd_variant() is not None
 
-    def __get_version_replaced(self, old_v, new_v):
+    def set_to_tier(self, tier):
         """
-        Get the version to replace
-        :param old_v: old version
-        :param new_v: new version
-        :return: active variant
+        Set to the variant of a LOD tier
+        :param tier
+        :return:
         """
-        if new_v in self.__active_variant: return None
-        variant = self.__active_variant.replace(old_v, new_v)
-        if variant in self.__versions.keys():
-            for version in self.__versions[variant]:
-                if self.__active_version == version[0]:
-                    return variant
-        return None
+        Standin.set_all_to_tier([self], tier, undo_chunk=False)
 
     def set_to_sd(self):
         """
         Set to a SD variant
         :return:
         """
-        variant = self.__get_version_replaced("HD", "SD")
-        if variant is not None:
-            self.set_active_variant_version(variant, self.__active_version)
+        self.set_to_tier("SD")
 
     def set_to_hd(self):
         """
         Set to a HD variant
         :return:
         """
-        variant = self.__get_version_replaced("SD", "HD")
-        if variant is not None:
-            self.set_active_variant_version(variant, self.__active_version)
+        self.set_to_tier("HD")
 
-    def convert_to_maya(self):
+    @staticmethod
+    def set_all_to_tier(standins, tier, undo_chunk=True):
         """
-        Convert the standin to maya object
-        :return:
+        Set many standins to the variant of a LOD tier
+        :param standins
+        :param tier
+        :param undo_chunk: whether the dso are written in their own undo chunk
+        :return: standins changed
         """
-        dso = self.__standin.dso.get()
-        maya_path = dso.replace(".ass", ".ma")
-
-        filename = os.path.basename(maya_path)
-        name, ext = os.path.splitext(filename)
-        name_space = name + "_00"
-        namespace_for_creation = name_space.replace(".", "_")
+        return Standin.set_variants_versions(
+            [(standin, standin.get_tier_variant(tier), standin.__active_version) for standin in standins], undo_chunk)
 
-        refNode = pm.system.createReference(maya_path, namespace=namespace_for_creation)
-        nodes = pm.FileReference.nodes(refNode)
-        transform = self.__standin.getParent()
-        trsf_parent = transform.getParent()
-        if trsf_parent:
-            pm.group(nodes[0], parent=trsf_parent)
+    @staticmethod
+    def set_all_to_sd(standins, undo_chunk=True):
+        """
+        Set many standins to their SD variant
+        :param standins
+        :param undo_chunk: whether the dso are written in their own undo chunk
+        :return: standins changed
+        """
+        return Standin.set_all_to_tier(standins, "SD", undo_chunk)
 
-        m = pm.xform(transform, matrix=True, query=True)
-        pm.xform(nodes[0], matrix=m)
+    @staticmethod
+    def set_all_to_hd(standins, undo_chunk=True):
+        """
+        Set many standins to their HD variant
+        :param standins
+        :param undo_chunk: whether the dso are written in their own undo chunk
+        :return: standins changed
+        """
+        return Standin.set_all_to_tier(standins, "HD", undo_chunk)
 
-        transform.visibility.set(False)
+    def convert_to_maya(self):
+        """
+        Convert the standin to maya object
+        :return:
+        """
+        StandinConverter(instancing=False).convert([self])
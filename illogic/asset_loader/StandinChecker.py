@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide2.QtCore import *
+
+# ######################################################################################################################
+
+_CHECK_WORKERS = 8
+
+# ######################################################################################################################
+
+
+class StandinChecker(QObject):
+    # Emitted from the workers with the generation of the check and the standins resolved, received in the ui thread
+    checked = Signal(int, list)
+
+    def __init__(self, max_workers=_CHECK_WORKERS, parent=None):
+        """
+        Constructor
+        :param max_workers: number of publish directories listed at the same time
+        :param parent
+        """
+        super(StandinChecker, self).__init__(parent)
+        self.__max_workers = max_workers
+        self.__executor = None
+        self.__generation = 0
+
+    def get_generation(self):
+        """
+        Getter of the generation of the last check, the results of the previous checks are obsolete
+        :return: generation
+        """
+        return self.__generation
+
+    def check(self, standins):
+        """
+        Retrieve (again for the standins already resolved, to see the new versions published) the variants and
+        versions of the standins in background, grouped by publish directory. The checks not started yet are dropped
+        :param standins
+        :return: number of standins to check
+        """
+        self.__generation += 1
+        standins_by_dir = {}
+        for standin in standins:
+            if standin.is_valid():
+                standins_by_dir.setdefault(standin.get_publish_ass_dir(), []).append(standin)
+        if len(standins_by_dir) == 0:
+            return 0
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.__max_workers)
+        nb_standins = 0
+        for standins_dir in standins_by_dir.values():
+            self.__executor.submit(self.__check_dir, self.__generation, standins_dir)
+            nb_standins += len(standins_dir)
+        return nb_standins
+
+    def __check_dir(self, generation, standins):
+        """
+        Refresh the standins of a publish directory then notify the ui thread. The standins of which the directory
+        can't be listed (ex : deleted or unreachable) are marked as failed
+        :param generation
+        :param standins
+        :return:
+        """
+        if generation != self.__generation:
+            return
+        try:
+            for standin in standins:
+                try:
+                    standin.refresh()
+                    standin.set_check_failed(False)
+                except OSError:
+                    standin.set_check_failed(True)
+        finally:
+            self.checked.emit(generation, standins)
+
+    def stop(self):
+        """
+        Drop the checks not started yet and release the workers
+        :return:
+        """
+        self.__generation += 1
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
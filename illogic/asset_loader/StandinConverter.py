@@ -0,0 +1,105 @@
+import os
+import time
+
+try:
+    import pymel.core as pm
+    import maya.cmds as cmds
+    import maya.api.OpenMaya as om
+except:
+    # Maya not found
+    pass
+
+
+class StandinConverter:
+    def __init__(self, instancing=True):
+        """
+        Constructor. The converter can be fed by many calls of convert, each Maya file is only referenced once
+        :param instancing: whether the other standins of a file become instances of the reference or duplicates
+        """
+        self.__instancing = instancing
+        # Root node of the reference by Maya file
+        self.__references = {}
+        # [nb standins, time spent] by Maya file
+        self.__timings = {}
+
+    def convert(self, standins):
+        """
+        Convert standins to Maya objects
+        :param standins
+        :return:
+        """
+        standins_by_file = {}
+        for standin in standins:
+            standin_path = standin.get_node_path()
+            dso = cmds.getAttr(standin_path + ".dso")
+            standins_by_file.setdefault(dso.replace(".ass", ".ma"), []).append(standin_path.rsplit("|", 1)[0])
+
+        for maya_path, transforms in standins_by_file.items():
+            start_time = time.time()
+            matrices = StandinConverter.__read_matrices(transforms)
+            nodes = []
+            for transform in transforms:
+                node = self.__create_node(maya_path)
+                trsf_parent = transform.rsplit("|", 1)[0]
+                if len(trsf_parent) > 0:
+                    pm.group(node, parent=trsf_parent)
+                elif node.getParent() is not None:
+                    # The copies are created next to the first reference root which may have been grouped
+                    pm.parent(node, world=True)
+                nodes.append(node)
+            # The matrices are written with cmds so they are part of the undo chunk of the operation, the API
+            # modifiers aren't recorded in the undo queue
+            for node, matrix in zip(nodes, matrices):
+                cmds.xform(node.longName(), matrix=matrix)
+            cmds.hide(transforms)
+            timing = self.__timings.setdefault(maya_path, [0, 0.0])
+            timing[0] += len(transforms)
+            timing[1] += time.time() - start_time
+
+    def __create_node(self, maya_path):
+        """
+        Reference the Maya file the first time then create an instance or a duplicate of the reference
+        :param maya_path
+        :return: root PyNode
+        """
+        if maya_path not in self.__references:
+            name, ext = os.path.splitext(os.path.basename(maya_path))
+            namespace_for_creation = (name + "_00").replace(".", "_")
+            ref_node = pm.system.createReference(maya_path, namespace=namespace_for_creation)
+            self.__references[maya_path] = pm.FileReference.nodes(ref_node)[0]
+            return self.__references[maya_path]
+        reference = self.__references[maya_path]
+        if self.__instancing:
+            return pm.instance(reference)[0]
+        return pm.duplicate(reference, returnRootsOnly=True)[0]
+
+    @staticmethod
+    def __read_matrices(transforms):
+        """
+        Read the local matrices of many transforms with a single selection list
+        :param transforms: full paths of the transforms
+        :return: matrices as lists of 16 floats
+        """
+        selection = om.MSelectionList()
+        for transform in transforms:
+            selection.add(transform)
+        matrices = []
+        for index in range(selection.length()):
+            matrix = om.MFnTransform(selection.getDagPath(index)).transformation().asMatrix()
+            matrices.append([matrix.getElement(row, col) for row in range(4) for col in range(4)])
+        return matrices
+
+    def get_timings(self):
+        """
+        Getter of the time spent by Maya file
+        :return: dict of (nb standins, time spent) by Maya file
+        """
+        return {maya_path: tuple(timing) for maya_path, timing in self.__timings.items()}
+
+    def print_timings(self):
+        """
+        Print the time spent by Maya file
+        :return:
+        """
+        for maya_path, (nb_standins, time_spent) in sorted(self.__timings.items(), key=lambda item: -item[1][1]):
+            print("%s\n\t--> %d standins in %.2fs" % (maya_path, nb_standins, time_spent))
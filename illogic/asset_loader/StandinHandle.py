@@ -0,0 +1,92 @@
+try:
+    import pymel.core as pm
+    import maya.api.OpenMaya as om
+except:
+    # Maya not found
+    pass
+
+
+class StandinHandle:
+    # Lightweight reference to an aiStandIn node listed through the API, the PyNode is only created when needed
+    __slots__ = ("__handle", "__dag_path", "__dso")
+
+    def __init__(self, dag_path, dso):
+        """
+        Constructor. The paths and names are read from the node each time so they follow the renames and the
+        reparentings of the standin
+        :param dag_path: MDagPath of the aiStandIn shape
+        :param dso: path of the standin file
+        """
+        self.__handle = om.MObjectHandle(dag_path.node())
+        self.__dag_path = om.MDagPath(dag_path)
+        self.__dso = dso
+
+    def __eq__(self, other):
+        return isinstance(other, StandinHandle) and self.__handle == other.__handle
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return self.__handle.hashCode()
+
+    def get_object(self):
+        """
+        Getter of the MObject of the node
+        :return: MObject
+        """
+        return self.__handle.object()
+
+    def __get_dag_path(self):
+        """
+        Get a valid DAG path of the shape, the path given is kept as long as it is valid (it follows the renames) and
+        is searched again after a reparenting
+        :return: MDagPath
+        """
+        if not self.__dag_path.isValid() and self.__handle.isAlive():
+            self.__dag_path = om.MDagPath.getAPathTo(self.__handle.object())
+        return self.__dag_path
+
+    def get_full_path(self):
+        """
+        Getter of the full DAG path of the shape
+        :return: full path
+        """
+        return self.__get_dag_path().fullPathName()
+
+    def get_name(self):
+        """
+        Getter of the shortest unique name of the shape
+        :return: name
+        """
+        return self.__get_dag_path().partialPathName()
+
+    def get_object_name(self):
+        """
+        Getter of the name of the transform
+        :return: object name
+        """
+        parent_path = om.MDagPath(self.__get_dag_path())
+        parent_path.pop()
+        return parent_path.partialPathName()
+
+    def get_dso(self):
+        """
+        Getter of the standin file path when the node was listed
+        :return: dso
+        """
+        return self.__dso
+
+    def is_alive(self):
+        """
+        Getter of whether the node still exists
+        :return: is alive
+        """
+        return self.__handle.isAlive()
+
+    def get_node(self):
+        """
+        Create the PyNode of the standin
+        :return: PyNode
+        """
+        return pm.PyNode(self.get_full_path())
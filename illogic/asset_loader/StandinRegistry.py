@@ -0,0 +1,195 @@
+from contextlib import contextmanager
+try:
+    import maya.api.OpenMaya as om
+    import maya.utils
+except:
+    # Maya not found
+    pass
+
+from illogic.asset_loader.StandinHandle import StandinHandle
+from illogic.asset_loader.standin_scene import list_scene_standins
+
+# ######################################################################################################################
+
+_STANDIN_TYPE = "aiStandIn"
+
+# ######################################################################################################################
+
+
+class StandinRegistry:
+    def __init__(self):
+        """
+        Constructor
+        """
+        # Standin handles by handle hash code
+        self.__standins = {}
+        self.__node_callbacks = {}
+        self.__dg_callbacks = []
+        self.__subscribers = []
+        # Nodes to (re)read at the next flush, removed handles to notify
+        self.__pending_nodes = {}
+        self.__pending_removed = []
+        self.__flush_scheduled = False
+        # Nodes of which the dso has only been changed while the changes were ignored
+        self.__silent_keys = set()
+        self.__ignore_depth = 0
+
+    def start(self):
+        """
+        List the standins of the scene once then keep the registry up to date with callbacks
+        :return:
+        """
+        if len(self.__dg_callbacks) > 0:
+            return
+        for standin_handle in list_scene_standins():
+            key = hash(standin_handle)
+            self.__standins[key] = standin_handle
+            self.__add_node_callbacks(key, standin_handle.get_object())
+        self.__dg_callbacks = [
+            om.MDGMessage.addNodeAddedCallback(self.__on_node_added, _STANDIN_TYPE),
+            om.MDGMessage.addNodeRemovedCallback(self.__on_node_removed, _STANDIN_TYPE),
+        ]
+
+    def stop(self):
+        """
+        Remove all the callbacks and empty the registry
+        :return:
+        """
+        for callback_id in self.__dg_callbacks:
+            om.MMessage.removeCallback(callback_id)
+        for callback_ids in self.__node_callbacks.values():
+            om.MMessage.removeCallbacks(callback_ids)
+        self.__dg_callbacks = []
+        self.__node_callbacks.clear()
+        self.__standins.clear()
+        self.__pending_nodes.clear()
+        self.__pending_removed = []
+        self.__silent_keys.clear()
+
+    def get_standins(self):
+        """
+        Getter of the standins of the scene
+        :return: standin handles
+        """
+        return list(self.__standins.values())
+
+    def subscribe(self, callback):
+        """
+        Call a function with the deltas of the registry
+        :param callback: function(added, removed, changed) with lists of standin handles
+        :return:
+        """
+        self.__subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Stop calling a function with the deltas of the registry
+        :param callback
+        :return:
+        """
+        if callback in self.__subscribers:
+            self.__subscribers.remove(callback)
+
+    @contextmanager
+    def ignore_changes(self):
+        """
+        Don't notify the subscribers of the dso changed inside the block (ex : by the tool itself), the registry
+        still keeps the new dso
+        :return:
+        """
+        self.__ignore_depth += 1
+        try:
+            yield
+        finally:
+            self.__ignore_depth -= 1
+
+    def __add_node_callbacks(self, key, obj):
+        """
+        Watch the changes of the dso and of the name of a standin node and of the name of its transform
+        :param key: hash code of the node handle
+        :param obj: MObject of the node
+        :return:
+        """
+        trsf_obj = om.MFnDagNode(obj).parent(0)
+        self.__node_callbacks[key] = [
+            om.MNodeMessage.addAttributeChangedCallback(obj, self.__on_attribute_changed),
+            om.MNodeMessage.addNameChangedCallback(obj, self.__on_name_changed),
+            om.MNodeMessage.addNameChangedCallback(trsf_obj, self.__on_trsf_name_changed, om.MObjectHandle(obj)),
+        ]
+
+    def __schedule(self, obj, silent=False):
+        """
+        Read a node at the next flush. The flush is deferred since a new node has no parent nor dso yet
+        :param obj
+        :param silent: whether the change is not notified to the subscribers
+        :return:
+        """
+        handle = om.MObjectHandle(obj)
+        key = handle.hashCode()
+        if silent and key not in self.__pending_nodes:
+            self.__silent_keys.add(key)
+        elif not silent:
+            self.__silent_keys.discard(key)
+        self.__pending_nodes[key] = handle
+        self.__schedule_flush()
+
+    def __schedule_flush(self):
+        if not self.__flush_scheduled:
+            self.__flush_scheduled = True
+            maya.utils.executeDeferred(self.__flush)
+
+    def __on_node_added(self, obj, *args):
+        self.__schedule(obj)
+
+    def __on_node_removed(self, obj, *args):
+        key = om.MObjectHandle(obj).hashCode()
+        self.__pending_nodes.pop(key, None)
+        callback_ids = self.__node_callbacks.pop(key, None)
+        if callback_ids is not None:
+            om.MMessage.removeCallbacks(callback_ids)
+        standin_handle = self.__standins.pop(key, None)
+        if standin_handle is not None:
+            self.__pending_removed.append(standin_handle)
+            self.__schedule_flush()
+
+    def __on_attribute_changed(self, msg, plug, *args):
+        if msg & om.MNodeMessage.kAttributeSet and plug.partialName(useLongNames=True) == "dso":
+            self.__schedule(plug.node(), self.__ignore_depth > 0)
+
+    def __on_name_changed(self, obj, *args):
+        self.__schedule(obj)
+
+    def __on_trsf_name_changed(self, trsf_obj, prev_name, handle):
+        if handle.isAlive():
+            self.__schedule(handle.object())
+
+    def __flush(self):
+        """
+        Read the nodes added or changed and notify the subscribers
+        :return:
+        """
+        self.__flush_scheduled = False
+        added = []
+        changed = []
+        for key, handle in self.__pending_nodes.items():
+            if not handle.isAlive() or not handle.isValid():
+                continue
+            obj = handle.object()
+            dag_path = om.MDagPath.getAPathTo(obj)
+            dso = om.MFnDependencyNode(obj).findPlug("dso", False).asString()
+            standin_handle = StandinHandle(dag_path, dso)
+            if key in self.__standins:
+                if key not in self.__silent_keys:
+                    changed.append(standin_handle)
+            else:
+                added.append(standin_handle)
+                self.__add_node_callbacks(key, obj)
+            self.__standins[key] = standin_handle
+        removed = self.__pending_removed
+        self.__pending_nodes = {}
+        self.__pending_removed = []
+        self.__silent_keys = set()
+
+        if len(added) > 0 or len(removed) > 0 or len(changed) > 0:
+            for callback in list(self.__subscribers):
+                callback(added, removed, changed)
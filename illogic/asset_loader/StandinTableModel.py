@@ -0,0 +1,290 @@
+from array import array
+
+from PySide2.QtCore import *
+from PySide2.QtGui import *
+
+from illogic.common.VersionList import version_key
+
+# ######################################################################################################################
+
+_HEADERS = ["Name", "Asset", "Variant", "Version"]
+
+_FLAG_UP_TO_DATE = 0x01
+# The variants and versions are still being retrieved
+_FLAG_CHECKING = 0x02
+# The publish directory couldn't be listed
+_FLAG_FAILED = 0x04
+
+# ######################################################################################################################
+
+
+class StandinTableModel(QAbstractTableModel):
+    # Icons shared by all the rows and all the models
+    __icons = {}
+
+    def __init__(self, asset_path, parent=None):
+        """
+        Constructor
+        :param asset_path: directory of the icons
+        :param parent
+        """
+        super(StandinTableModel, self).__init__(parent)
+        self.__asset_path = asset_path
+        # Columnar store, one entry per row
+        self.__names = []
+        self.__standins = []
+        self.__object_names = []
+        self.__assets = []
+        self.__variants = []
+        self.__versions = []
+        self.__flags = array("B")
+        # -1 keeps the rows sorted by standin node name
+        self.__sort_column = -1
+        self.__sort_order = Qt.AscendingOrder
+
+    @classmethod
+    def __get_icon(cls, icon_path):
+        """
+        Get an icon, loading it only once
+        :param icon_path
+        :return: icon
+        """
+        icon = cls.__icons.get(icon_path)
+        if icon is None:
+            icon = QIcon(icon_path)
+            cls.__icons[icon_path] = icon
+        return icon
+
+    @staticmethod
+    def __get_standin_values(standin):
+        """
+        Get the values displayed of a standin
+        :param standin
+        :return: variant, version, flags
+        """
+        active_version = standin.get_active_version()
+        if not standin.is_resolved():
+            if standin.is_check_failed():
+                return standin.get_active_variant(), active_version + " (unreachable)", _FLAG_FAILED
+            return standin.get_active_variant(), active_version + " (checking...)", _FLAG_CHECKING
+        if standin.is_up_to_date():
+            return standin.get_active_variant(), active_version, _FLAG_UP_TO_DATE
+        return standin.get_active_variant(), active_version + " -> " + standin.last_version(), 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.__names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return _HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return self.__object_names[row]
+            elif column == 1:
+                return self.__assets[row]
+            elif column == 2:
+                return self.__variants[row]
+            return self.__versions[row]
+        elif role == Qt.DecorationRole and column == 0:
+            if self.__flags[row] & _FLAG_CHECKING:
+                return None
+            icon_name = "/valid.png" if self.__flags[row] & _FLAG_UP_TO_DATE else "/warning.png"
+            return self.__get_icon(self.__asset_path + icon_name)
+        elif role == Qt.TextAlignmentRole and column > 0:
+            return Qt.AlignCenter
+        elif role == Qt.UserRole:
+            return self.__standins[row]
+        return None
+
+    def get_standin(self, row):
+        """
+        Getter of the standin of a row
+        :param row
+        :return: standin
+        """
+        return self.__standins[row]
+
+    def is_up_to_date(self, row):
+        """
+        Getter of whether the standin of a row is up to date
+        :param row
+        :return: is up to date
+        """
+        return bool(self.__flags[row] & _FLAG_UP_TO_DATE)
+
+    def is_checking(self, row):
+        """
+        Getter of whether the standin of a row is still being checked
+        :param row
+        :return: is checking
+        """
+        return bool(self.__flags[row] & _FLAG_CHECKING)
+
+    def is_failed(self, row):
+        """
+        Getter of whether the publish directory of the standin of a row couldn't be listed
+        :param row
+        :return: is failed
+        """
+        return bool(self.__flags[row] & _FLAG_FAILED)
+
+    def set_standins(self, standins):
+        """
+        Replace all the rows
+        :param standins: standins by node name
+        :return:
+        """
+        self.beginResetModel()
+        self.__names = []
+        self.__standins = []
+        self.__object_names = []
+        self.__assets = []
+        self.__variants = []
+        self.__versions = []
+        self.__flags = array("B")
+        for name, standin in standins.items():
+            self.__append(name, standin)
+        self.__sort_rows()
+        self.endResetModel()
+
+    def add_standins(self, standins):
+        """
+        Add rows
+        :param standins: standins by node name
+        :return:
+        """
+        if len(standins) == 0:
+            return
+        first_row = len(self.__names)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(standins) - 1)
+        for name, standin in standins.items():
+            self.__append(name, standin)
+        self.endInsertRows()
+        self.sort(self.__sort_column, self.__sort_order)
+
+    def remove_standins(self, names):
+        """
+        Remove the rows of the standins given
+        :param names: names of the standins nodes
+        :return:
+        """
+        names = set(names)
+        rows = [row for row, name in enumerate(self.__names) if name in names]
+        # Remove the contiguous ranges from the last one so the rows before stay valid
+        for first_row, last_row in reversed(self.__get_ranges(rows)):
+            self.beginRemoveRows(QModelIndex(), first_row, last_row)
+            for column in self.__get_columns():
+                del column[first_row:last_row + 1]
+            self.endRemoveRows()
+
+    def refresh_rows(self, standins=None):
+        """
+        Recompute the values of the rows and notify the views only for the rows that changed
+        :param standins: standins of the rows to recompute, all the rows if None
+        :return:
+        """
+        if standins is None:
+            rows = range(len(self.__standins))
+        else:
+            standins = set(standins)
+            rows = [row for row, standin in enumerate(self.__standins) if standin in standins]
+        changed_rows = []
+        renamed = False
+        for row in rows:
+            standin = self.__standins[row]
+            object_name = standin.get_object_name()
+            variant, version, flags = self.__get_standin_values(standin)
+            if object_name != self.__object_names[row] or variant != self.__variants[row] or \
+                    version != self.__versions[row] or flags != self.__flags[row]:
+                renamed = renamed or object_name != self.__object_names[row]
+                self.__object_names[row] = object_name
+                self.__variants[row] = variant
+                self.__versions[row] = version
+                self.__flags[row] = flags
+                changed_rows.append(row)
+        for first_row, last_row in self.__get_ranges(changed_rows):
+            self.dataChanged.emit(self.index(first_row, 0), self.index(last_row, len(_HEADERS) - 1))
+        if len(changed_rows) > 0 and (self.__sort_column >= 2 or (renamed and self.__sort_column == 0)):
+            self.sort(self.__sort_column, self.__sort_order)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.__sort_column = column
+        self.__sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        persistent_indexes = self.persistentIndexList()
+        new_rows = self.__sort_rows()
+        self.changePersistentIndexList(
+            persistent_indexes,
+            [self.index(new_rows[index.row()], index.column()) for index in persistent_indexes])
+        self.layoutChanged.emit()
+
+    def __append(self, name, standin):
+        """
+        Append a row without notifying the views
+        :param name: name of the standin node
+        :param standin
+        :return:
+        """
+        variant, version, flags = self.__get_standin_values(standin)
+        self.__names.append(name)
+        self.__standins.append(standin)
+        self.__object_names.append(standin.get_object_name())
+        self.__assets.append(standin.get_standin_name())
+        self.__variants.append(variant)
+        self.__versions.append(version)
+        self.__flags.append(flags)
+
+    def __get_columns(self):
+        return [self.__names, self.__standins, self.__object_names, self.__assets, self.__variants, self.__versions,
+                self.__flags]
+
+    def __sort_rows(self):
+        """
+        Sort the rows according to the sort column without notifying the views
+        :return: new row of each previous row
+        """
+        if self.__sort_column == 0:
+            keys = self.__object_names
+        elif self.__sort_column == 1:
+            keys = self.__assets
+        elif self.__sort_column == 2:
+            keys = self.__variants
+        elif self.__sort_column == 3:
+            keys = [version_key(standin.get_active_version()) for standin in self.__standins]
+        else:
+            keys = self.__names
+        names = self.__names
+        order = sorted(range(len(names)), key=lambda row: (keys[row], names[row]),
+                       reverse=self.__sort_order == Qt.DescendingOrder)
+        for column in self.__get_columns():
+            reordered = [column[row] for row in order]
+            column[:] = array(column.typecode, reordered) if type(column) is array else reordered
+        new_rows = [0] * len(order)
+        for new_row, row in enumerate(order):
+            new_rows[row] = new_row
+        return new_rows
+
+    @staticmethod
+    def __get_ranges(rows):
+        """
+        Group sorted rows in contiguous ranges
+        :param rows: sorted rows
+        :return: list of (first row, last row)
+        """
+        ranges = []
+        for row in rows:
+            if len(ranges) > 0 and ranges[-1][1] == row - 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+        return [(first_row, last_row) for first_row, last_row in ranges]
@@ -0,0 +1,121 @@
+from collections import namedtuple
+
+try:
+    import maya.cmds as cmds
+    import maya.api.OpenMaya as om
+except:
+    # Maya not found
+    pass
+
+from illogic.common.standin_utils import get_version_file
+from illogic.common.ass_file_info import get_ass_files_info
+
+# ######################################################################################################################
+
+ORDER_LARGEST_FIRST = "Largest first"
+ORDER_FARTHEST_FIRST = "Farthest from camera first"
+
+# ######################################################################################################################
+
+# Switches to apply : list of (standin, variant, version)
+BudgetProposal = namedtuple("BudgetProposal", ["scene_size", "budget", "switches", "proposed_size"])
+
+# ######################################################################################################################
+
+
+def __get_active_file(standin):
+    return get_version_file(standin.get_publish_ass_dir(), standin.get_standin_name(),
+                            standin.get_active_variant(), standin.get_active_version())
+
+
+def __get_sd_file(standin, sd_variant):
+    return get_version_file(standin.get_publish_ass_dir(), standin.get_standin_name(),
+                            sd_variant, standin.get_active_version())
+
+
+def get_camera():
+    """
+    Get the camera of the viewport with the focus or of the first viewport visible
+    :return: camera
+    """
+    panel = cmds.getPanel(withFocus=True)
+    if panel is None or cmds.getPanel(typeOf=panel) != "modelPanel":
+        model_panels = [p for p in cmds.getPanel(visiblePanels=True) or [] if cmds.getPanel(typeOf=p) == "modelPanel"]
+        panel = model_panels[0] if len(model_panels) > 0 else None
+    return cmds.modelPanel(panel, query=True, camera=True) if panel is not None else "persp"
+
+
+def __get_distances(standins, files_info, camera):
+    """
+    Get the distances from the camera to the standins, the center of the bounds of the .ass header is used when
+    there is one, the pivot of the standin otherwise. The world matrices are read with a single selection list
+    :param standins
+    :param files_info: AssFileInfo by path
+    :param camera
+    :return: distances
+    """
+    selection = om.MSelectionList()
+    selection.add(camera)
+    for standin in standins:
+        selection.add(standin.get_node_path())
+    camera_pos = om.MPoint() * selection.getDagPath(0).inclusiveMatrix()
+    distances = []
+    for index, standin in enumerate(standins):
+        info = files_info.get(__get_active_file(standin))
+        if info is not None and info.bounds is not None:
+            bounds = info.bounds
+            center = om.MPoint((bounds[0] + bounds[3]) / 2, (bounds[1] + bounds[4]) / 2, (bounds[2] + bounds[5]) / 2)
+        else:
+            center = om.MPoint()
+        distances.append(camera_pos.distanceTo(center * selection.getDagPath(index + 1).inclusiveMatrix()))
+    return distances
+
+
+def propose_sd_switches(standins, budget, order=ORDER_LARGEST_FIRST, camera=None):
+    """
+    Propose the HD to SD switches that bring the size of the active .ass files of the standins under a budget.
+    Sorted by largest saving first it is the smallest set of switches
+    :param standins: resolved standins
+    :param budget: in bytes
+    :param order: ORDER_LARGEST_FIRST or ORDER_FARTHEST_FIRST
+    :param camera: camera used with ORDER_FARTHEST_FIRST, the camera of the viewport if None
+    :return: BudgetProposal
+    """
+    standins = [standin for standin in standins if standin.is_valid()]
+    # Only the HD standins are switched, the other tiers (proxy, LOD0...) have SD siblings too
+    sd_variants = [standin.get_sd_variant() if standin.get_tier() == "HD" else None for standin in standins]
+    ass_paths = [__get_active_file(standin) for standin in standins]
+    ass_paths.extend(__get_sd_file(standin, sd_variant)
+                     for standin, sd_variant in zip(standins, sd_variants) if sd_variant is not None)
+    files_info = get_ass_files_info(ass_paths)
+
+    def get_size(ass_path):
+        info = files_info.get(ass_path)
+        return info.size if info is not None else 0
+
+    scene_size = 0
+    candidates = []
+    for standin, sd_variant in zip(standins, sd_variants):
+        size = get_size(__get_active_file(standin))
+        scene_size += size
+        if sd_variant is not None:
+            saving = size - get_size(__get_sd_file(standin, sd_variant))
+            if saving > 0:
+                candidates.append((standin, sd_variant, saving))
+
+    if order == ORDER_FARTHEST_FIRST and len(candidates) > 0:
+        distances = __get_distances([candidate[0] for candidate in candidates], files_info,
+                                    camera if camera is not None else get_camera())
+        keys = [(-distance, -candidate[2]) for candidate, distance in zip(candidates, distances)]
+    else:
+        keys = [-candidate[2] for candidate in candidates]
+    candidates = [candidate for key, candidate in sorted(zip(keys, candidates), key=lambda item: item[0])]
+
+    switches = []
+    proposed_size = scene_size
+    for standin, sd_variant, saving in candidates:
+        if proposed_size <= budget:
+            break
+        switches.append((standin, sd_variant, standin.get_active_version()))
+        proposed_size -= saving
+    return BudgetProposal(scene_size, budget, switches, proposed_size)
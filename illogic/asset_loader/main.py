@@ -1,7 +1,7 @@
 import importlib
-from illogic.common import utils
+from illogic.common.module_reloader import reload_package
 
-utils.unload_packages(silent=True, package="illogic.asset_loader")
+reload_package("illogic.asset_loader", silent=False)
 importlib.import_module("illogic.asset_loader")
 from illogic.asset_loader.AssetLoader import AssetLoader
 try:
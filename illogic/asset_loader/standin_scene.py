@@ -0,0 +1,104 @@
+try:
+    import maya.api.OpenMaya as om
+except:
+    # Maya not found
+    pass
+
+from illogic.asset_loader.StandinHandle import StandinHandle
+
+# ######################################################################################################################
+
+_STANDIN_TYPE = "aiStandIn"
+
+# ######################################################################################################################
+
+
+def __is_standin(obj):
+    return obj.hasFn(om.MFn.kPluginShape) and om.MFnDependencyNode(obj).typeName == _STANDIN_TYPE
+
+
+def __add_standin(standins, dag_path):
+    # Dedupe the standins by handle
+    key = om.MObjectHandle(dag_path.node()).hashCode()
+    if key not in standins:
+        dso = om.MFnDependencyNode(dag_path.node()).findPlug("dso", False).asString()
+        standins[key] = StandinHandle(dag_path, dso)
+
+
+def __add_proxy_standin(standins, dag_path):
+    # A transform under the transform of a standin is a proxy of the standin
+    if not dag_path.hasFn(om.MFn.kTransform) or dag_path.length() < 2:
+        return
+    parent_path = om.MDagPath(dag_path)
+    parent_path.pop()
+    if not parent_path.hasFn(om.MFn.kTransform):
+        return
+    for index_child in range(parent_path.childCount()):
+        child = parent_path.child(index_child)
+        if child.hasFn(om.MFn.kShape):
+            # Only the first shape is considered, like PyNode.getShape
+            if __is_standin(child):
+                shape_path = om.MDagPath(parent_path)
+                shape_path.push(child)
+                __add_standin(standins, shape_path)
+            return
+
+
+def list_scene_standins():
+    """
+    List all the standins of the scene
+    :return: standin handles
+    """
+    standins = {}
+    it_nodes = om.MItDependencyNodes(om.MFn.kPluginShape)
+    while not it_nodes.isDone():
+        obj = it_nodes.thisNode()
+        if om.MFnDependencyNode(obj).typeName == _STANDIN_TYPE:
+            __add_standin(standins, om.MDagPath.getAPathTo(obj))
+        it_nodes.next()
+    return list(standins.values())
+
+
+def list_selected_standins():
+    """
+    List the standins selected, under the nodes selected or of which a proxy is selected with a single traversal
+    of the DAG
+    :return: standin handles
+    """
+    selection = om.MGlobal.getActiveSelectionList()
+    roots = {}
+    standins = {}
+    for index_sel in range(selection.length()):
+        try:
+            dag_path = selection.getDagPath(index_sel)
+        except (TypeError, RuntimeError):
+            # Not a DAG node
+            continue
+        __add_proxy_standin(standins, dag_path)
+        roots[dag_path.fullPathName()] = dag_path
+
+    # Nested roots are traversed with their ancestor
+    it_dag = om.MItDag(om.MItDag.kDepthFirst, om.MFn.kPluginShape)
+    for full_path in roots.keys():
+        path_parts = full_path.split("|")
+        if any("|".join(path_parts[:i]) in roots for i in range(2, len(path_parts))):
+            continue
+        it_dag.reset(roots[full_path], om.MItDag.kDepthFirst, om.MFn.kPluginShape)
+        while not it_dag.isDone():
+            if __is_standin(it_dag.currentItem()):
+                __add_standin(standins, it_dag.getPath())
+            it_dag.next()
+    return list(standins.values())
+
+
+def list_standins(registry=None):
+    """
+    List the standins selected or all the standins of the scene if nothing is selected
+    :param registry: StandinRegistry giving the standins of the scene without listing them
+    :return: standin handles, whether they come from the selection
+    """
+    if om.MGlobal.getActiveSelectionList().length() == 0:
+        if registry is not None:
+            return registry.get_standins(), False
+        return list_scene_standins(), False
+    return list_selected_standins(), True
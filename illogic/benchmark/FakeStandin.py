@@ -0,0 +1,75 @@
+# ######################################################################################################################
+# Lightweight objects mimicking the pymel aiStandIn nodes used by the standin parsing, to benchmark it outside of Maya
+# ######################################################################################################################
+
+
+class FakeAttribute:
+    __slots__ = ("__value",)
+
+    def __init__(self, value):
+        """
+        Constructor
+        :param value
+        """
+        self.__value = value
+
+    def get(self):
+        """
+        Getter of the value
+        :return: value
+        """
+        return self.__value
+
+    def set(self, value):
+        """
+        Setter of the value
+        :param value
+        :return:
+        """
+        self.__value = value
+
+
+class FakeTransform:
+    __slots__ = ("__name",)
+
+    def __init__(self, name):
+        """
+        Constructor
+        :param name
+        """
+        self.__name = name
+
+    def name(self):
+        """
+        Getter of the name
+        :return: name
+        """
+        return self.__name
+
+
+class FakeStandin:
+    __slots__ = ("__name", "__parent", "dso")
+
+    def __init__(self, name, dso):
+        """
+        Constructor
+        :param name: name of the transform, the shape is named <name>Shape like in Maya
+        :param dso: path of the .ass file
+        """
+        self.__name = name + "Shape"
+        self.__parent = FakeTransform(name)
+        self.dso = FakeAttribute(dso)
+
+    def name(self):
+        """
+        Getter of the name
+        :return: name
+        """
+        return self.__name
+
+    def getParent(self):
+        """
+        Getter of the parent transform
+        :return: parent
+        """
+        return self.__parent
@@ -0,0 +1,93 @@
+import argparse
+import shutil
+import tempfile
+
+from illogic.common import standin_utils
+from illogic.asset_loader.Standin import Standin
+from illogic.benchmark.FakeStandin import FakeStandin
+from illogic.benchmark.measure import measure
+from illogic.benchmark.publish_tree import generate_publish_tree, get_standin_file_paths
+
+# ######################################################################################################################
+
+_DEFAULT_SIZES = [1000, 10000, 50000]
+_STANDINS_PER_ASSET = 20
+_NB_VARIANTS = 2
+_NB_VERSIONS = 10
+
+# ######################################################################################################################
+
+
+def __reset_caches():
+    standin_utils.invalidate_publish_index()
+    standin_utils.parse_standin_path.cache_clear()
+
+
+def __retrieve_standins(standins_nodes):
+    # Same steps as AssetLoader.__retrieve_standins once the nodes are listed
+    standins = [Standin(standin_node, lazy=True) for standin_node in standins_nodes]
+    Standin.resolve_all(standins)
+    return [standin for standin in standins if standin.is_valid() and not standin.is_up_to_date()]
+
+
+def run_benchmark(root_dir, nb_standins, standins_per_asset, nb_variants, nb_versions):
+    """
+    Benchmark the scan of the publish tree, the parsing and the construction of standins
+    :param root_dir: directory in which the publish tree is generated
+    :param nb_standins
+    :param standins_per_asset
+    :param nb_variants
+    :param nb_versions
+    :return: measures by phase
+    """
+    nb_assets = max(1, nb_standins // standins_per_asset)
+    publish_ass_dirs = generate_publish_tree(root_dir, nb_assets, nb_variants, nb_versions)
+    standin_nodes = [FakeStandin("standin%06d" % i, standin_file_path) for i, standin_file_path in
+                     enumerate(get_standin_file_paths(root_dir, nb_standins, nb_assets, nb_variants, nb_versions))]
+
+    def scan():
+        for publish_ass_dir in publish_ass_dirs:
+            standin_utils.refresh_publish_index(publish_ass_dir)
+
+    def parse():
+        for standin_node in standin_nodes:
+            standin_utils.parse_standin(standin_node)
+
+    def construct():
+        __retrieve_standins(standin_nodes)
+
+    return {
+        "scan": measure(scan, __reset_caches),
+        "parse": measure(parse, __reset_caches),
+        "construction": measure(construct, __reset_caches),
+        "construction (warm)": measure(construct),
+    }
+
+
+def print_results(nb_standins, results):
+    print("%d standins" % nb_standins)
+    for phase, result in results.items():
+        print("  %-20s %9.3f s %10d syscalls %10.2f MB peak" %
+              (phase, result["wall_time"], result["syscalls"], result["peak_memory"] / 1e6))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the standin parsing on synthetic publish trees")
+    parser.add_argument("--sizes", type=int, nargs="+", default=_DEFAULT_SIZES, help="numbers of standins")
+    parser.add_argument("--standins-per-asset", type=int, default=_STANDINS_PER_ASSET)
+    parser.add_argument("--variants", type=int, default=_NB_VARIANTS, help="number of variants per asset")
+    parser.add_argument("--versions", type=int, default=_NB_VERSIONS, help="number of versions per variant")
+    parser.add_argument("--root", default=None, help="directory of the publish trees (temporary by default)")
+    args = parser.parse_args()
+
+    for nb_standins in args.sizes:
+        root_dir = tempfile.mkdtemp(prefix="illogic_benchmark_", dir=args.root)
+        try:
+            results = run_benchmark(root_dir, nb_standins, args.standins_per_asset, args.variants, args.versions)
+        finally:
+            shutil.rmtree(root_dir, ignore_errors=True)
+        print_results(nb_standins, results)
+
+
+if __name__ == "__main__":
+    main()
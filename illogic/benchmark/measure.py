@@ -0,0 +1,69 @@
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# ######################################################################################################################
+
+# Functions of the os module counted as filesystem syscalls (os.path.isdir and os.path.isfile call os.stat)
+_COUNTED_FUNCTIONS = ["scandir", "listdir", "stat", "lstat"]
+
+# ######################################################################################################################
+
+
+@contextmanager
+def count_syscalls(counts):
+    """
+    Count the calls to the filesystem functions of the os module done in the context
+    :param counts: dict filled with the number of calls by function name
+    :return:
+    """
+    originals = {}
+
+    def counted(name, function):
+        def wrapper(*args, **kwargs):
+            counts[name] = counts.get(name, 0) + 1
+            return function(*args, **kwargs)
+        return wrapper
+
+    for name in _COUNTED_FUNCTIONS:
+        originals[name] = getattr(os, name)
+        setattr(os, name, counted(name, originals[name]))
+    try:
+        yield counts
+    finally:
+        for name, function in originals.items():
+            setattr(os, name, function)
+
+
+def measure(function, setup=None):
+    """
+    Run a function twice : once to measure its wall time and its syscalls and once to measure its peak memory
+    (tracemalloc slows the execution down)
+    :param function
+    :param setup: function called before each run to reset the caches
+    :return: result of the measures
+    """
+    if setup is not None:
+        setup()
+    counts = {}
+    with count_syscalls(counts):
+        start = time.perf_counter()
+        function()
+        wall_time = time.perf_counter() - start
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "wall_time": wall_time,
+        "syscalls": sum(counts.values()),
+        "syscalls_detail": counts,
+        "peak_memory": peak_memory,
+    }
@@ -0,0 +1,67 @@
+import os
+
+# ######################################################################################################################
+
+_VARIANT_NAMES = ["HD", "SD", "proxy", "LOD0", "LOD1", "LOD2", "LOD3"]
+
+# ######################################################################################################################
+
+
+def get_asset_name(index_asset):
+    return "asset%05d" % index_asset
+
+
+def get_variant_name(index_variant):
+    if index_variant < len(_VARIANT_NAMES):
+        return _VARIANT_NAMES[index_variant]
+    return "var%02d" % index_variant
+
+
+def get_version_name(index_version):
+    return "v%03d" % (index_version + 1)
+
+
+def generate_publish_tree(root_dir, nb_assets, nb_variants, nb_versions, ass_file_size=0):
+    """
+    Generate a synthetic publish tree : <root_dir>/<asset>/<asset>_<variant>/<version>/<asset>_<variant>.ass
+    :param root_dir
+    :param nb_assets
+    :param nb_variants: number of variants per asset
+    :param nb_versions: number of versions per variant
+    :param ass_file_size: size in bytes of the .ass files
+    :return: publish directory of each asset
+    """
+    publish_ass_dirs = []
+    for index_asset in range(nb_assets):
+        asset_name = get_asset_name(index_asset)
+        publish_ass_dir = root_dir + "/" + asset_name
+        for index_variant in range(nb_variants):
+            variant_dir_name = asset_name + "_" + get_variant_name(index_variant)
+            for index_version in range(nb_versions):
+                version_dir = publish_ass_dir + "/" + variant_dir_name + "/" + get_version_name(index_version)
+                os.makedirs(version_dir, exist_ok=True)
+                with open(version_dir + "/" + variant_dir_name + ".ass", "wb") as f:
+                    f.truncate(ass_file_size)
+        publish_ass_dirs.append(publish_ass_dir)
+    return publish_ass_dirs
+
+
+def get_standin_file_paths(root_dir, nb_standins, nb_assets, nb_variants, nb_versions):
+    """
+    Get the dso of standins spread over the assets of a tree generated by generate_publish_tree. One standin out of
+    three is out of date
+    :param root_dir
+    :param nb_standins
+    :param nb_assets
+    :param nb_variants
+    :param nb_versions
+    :return: standin file paths
+    """
+    standin_file_paths = []
+    for index_standin in range(nb_standins):
+        asset_name = get_asset_name(index_standin % nb_assets)
+        variant_dir_name = asset_name + "_" + get_variant_name(index_standin % nb_variants)
+        index_version = nb_versions - 1 if index_standin % 3 != 0 else index_standin % nb_versions
+        standin_file_paths.append(root_dir + "/" + asset_name + "/" + variant_dir_name + "/" +
+                                  get_version_name(index_version) + "/" + variant_dir_name + ".ass")
+    return standin_file_paths
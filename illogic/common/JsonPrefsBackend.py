@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    import msvcrt
+
+from illogic.common.file_utils import write_file_atomic
+
+# ######################################################################################################################
+
+_LOCK_EXTENSION = ".lock"
+
+# ######################################################################################################################
+
+# Parsed datas by prefs file with the mtime and the size of the file they were read at, shared by all the instances
+_DATAS_CACHE = {}
+_DATAS_CACHE_LOCK = threading.Lock()
+
+# ######################################################################################################################
+
+
+class JsonPrefsBackend:
+    def __init__(self, file_path):
+        """
+        Constructor. All the keys are stored in a single JSON file
+        :param file_path: path of the prefs file
+        """
+        self.__file_path = file_path
+
+    def get_path(self):
+        """
+        Getter of the prefs file path
+        :return: file path
+        """
+        return self.__file_path
+
+    def get_datas(self):
+        """
+        Get the datas of the prefs file, the file is only read again when its mtime or its size changed
+        :return: datas shared by the instances (not to modify) or None if the file doesn't exist
+        """
+        try:
+            stat = os.stat(self.__file_path)
+        except OSError:
+            return None
+        with _DATAS_CACHE_LOCK:
+            cached = _DATAS_CACHE.get(self.__file_path)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        return self.__read()
+
+    def __read(self):
+        """
+        Read the prefs file and refresh the cache
+        :return: datas or None if the file doesn't exist
+        """
+        try:
+            f = open(self.__file_path, "r")
+        except FileNotFoundError:
+            return None
+        with f:
+            stat = os.fstat(f.fileno())
+            content = f.read()
+
+        if len(content) == 0:
+            datas = {}
+        else:
+            datas = json.loads(content)
+        self.__set_cache(stat, datas)
+        return datas
+
+    def __set_cache(self, stat, datas):
+        with _DATAS_CACHE_LOCK:
+            _DATAS_CACHE[self.__file_path] = (stat.st_mtime_ns, stat.st_size, datas)
+
+    def contains(self, key):
+        datas = self.get_datas()
+        return datas is not None and key in datas
+
+    def get(self, key, default=None):
+        datas = self.get_datas()
+        return datas.get(key, default) if datas is not None else default
+
+    @contextmanager
+    def __lock(self):
+        """
+        Advisory lock of the prefs file shared by the Maya sessions, held during a read-modify-write
+        :return:
+        """
+        f = open(self.__file_path + _LOCK_EXTENSION, "a+")
+        try:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if os.name == "nt":
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        finally:
+            f.close()
+
+    def write(self, values, removed_keys):
+        """
+        Apply changes to the datas of the file in a single read-modify-write. The datas are written to a temporary
+        file which replaces the prefs file so that a reader never sees a partial file
+        :param values: values set by key
+        :param removed_keys: keys removed
+        :return:
+        """
+        with self.__lock():
+            # Read again even if the mtime and the size didn't change, the mtime of network filesystems is too coarse
+            # to see the writes of another session made in the same second
+            datas = self.__read()
+            datas = dict(datas) if datas is not None else {}
+            for key in removed_keys:
+                datas.pop(key, None)
+            datas.update(values)
+
+            write_file_atomic(self.__file_path, lambda f: json.dump(datas, f, separators=(",", ":")))
+            self.__set_cache(os.stat(self.__file_path), datas)
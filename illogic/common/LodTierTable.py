@@ -0,0 +1,78 @@
+# ######################################################################################################################
+
+DEFAULT_LOD_TIERS = ("proxy", "SD", "HD", "LOD0", "LOD1", "LOD2", "LOD3")
+
+# ######################################################################################################################
+
+
+class LodTierTable:
+    # Built once per version table of an asset, then every lookup is a dict or a set lookup
+    __slots__ = ("__tiers", "__variant_tiers", "__siblings")
+
+    def __init__(self, versions, tiers=DEFAULT_LOD_TIERS):
+        """
+        Constructor. Variants differing only by their tier token (ex : "HD" and "SD", "propsLOD0" and "propsLOD1")
+        are siblings
+        :param versions: variants and versions of an asset {variant: versions}
+        :param tiers: tier tokens
+        """
+        self.__tiers = tuple(tiers)
+        # (base, tier) by variant
+        self.__variant_tiers = {}
+        # {tier: (variant, versions)} by base
+        self.__siblings = {}
+        # The longest tokens are tested first so a token contained in another one doesn't match instead of it
+        tokens = sorted(self.__tiers, key=len, reverse=True)
+        for variant, variant_versions in versions.items():
+            for tier in tokens:
+                if tier in variant:
+                    base = variant.replace(tier, "\0")
+                    self.__variant_tiers[variant] = (base, tier)
+                    self.__siblings.setdefault(base, {})[tier] = (variant, frozenset(variant_versions))
+                    break
+
+    def get_tiers(self):
+        """
+        Getter of the tier tokens
+        :return: tiers
+        """
+        return self.__tiers
+
+    def get_tier(self, variant):
+        """
+        Get the tier of a variant
+        :param variant
+        :return: tier or None
+        """
+        variant_tier = self.__variant_tiers.get(variant)
+        return variant_tier[1] if variant_tier is not None else None
+
+    def get_variant(self, variant, version, tier):
+        """
+        Get the sibling variant of a variant in another tier that has the same version
+        :param variant
+        :param version
+        :param tier
+        :return: sibling variant or None if there is none or if the variant is already in this tier
+        """
+        variant_tier = self.__variant_tiers.get(variant)
+        if variant_tier is None or variant_tier[1] == tier:
+            return None
+        sibling = self.__siblings[variant_tier[0]].get(tier)
+        if sibling is None or version not in sibling[1]:
+            return None
+        return sibling[0]
+
+    def get_available_tiers(self, variant, version):
+        """
+        Get the tiers in which a variant and version can be switched
+        :param variant
+        :param version
+        :return: sibling variant by tier
+        """
+        variant_tier = self.__variant_tiers.get(variant)
+        if variant_tier is None:
+            return {}
+        return {tier: sibling_variant
+                for tier, (sibling_variant, sibling_versions) in self.__siblings[variant_tier[0]].items()
+                if tier != variant_tier[1] and version in sibling_versions}
@@ -1,13 +1,26 @@
-import json
+import copy
 import os
 import ctypes
 import sys
+from contextlib import contextmanager
+
+from illogic.common.JsonPrefsBackend import JsonPrefsBackend
+from illogic.common.SqlitePrefsBackend import SqlitePrefsBackend
 
 # ######################################################################################################################
 
 _FOLDER_PREFS = ".illogic_prefs"
 _COMMON_FILE = "common"
 
+BACKEND_JSON = "json"
+BACKEND_SQLITE = "sqlite"
+# Backend used when none is given to the constructor
+_BACKEND_ENV = "ILLOGIC_PREFS_BACKEND"
+_SQLITE_EXTENSION = ".sqlite"
+
+# Value of a key removed during a batch
+_REMOVED = object()
+
 # ######################################################################################################################
 
 
@@ -17,82 +30,111 @@ class PrefsNotInitialized(Exception):
 
 
 class Prefs:
-    def __init__(self, file_name=_COMMON_FILE):
+    def __init__(self, file_name=_COMMON_FILE, backend=None):
+        """
+        Constructor
+        :param file_name: name of the prefs of the tool
+        :param backend: BACKEND_JSON (one JSON file) or BACKEND_SQLITE (one row per key, for large prefs). By default
+        the ILLOGIC_PREFS_BACKEND environment variable or BACKEND_JSON
+        """
         if type(file_name) != str:
             raise TypeError("Project name must be a string")
+        if backend is None:
+            backend = os.environ.get(_BACKEND_ENV, BACKEND_JSON)
+        if backend not in (BACKEND_JSON, BACKEND_SQLITE):
+            raise ValueError("Unknown prefs backend : " + str(backend))
 
         path_home = os.path.expanduser("~")
         self.__path_prefs = path_home + "/" + _FOLDER_PREFS
         self.__file_path = self.__path_prefs + "/" + file_name
+        self.__backend_name = backend
+        self.__backend = None
+        # Changes of the batch in progress by key and number of batches nested
+        self.__batch_changes = None
+        self.__batch_depth = 0
 
     def __create_folder_prefs(self):
         if not os.path.exists(self.__path_prefs):
             os.makedirs(self.__path_prefs)
-            ctypes.windll.kernel32.SetFileAttributesW(self.__path_prefs, 0x02)
-
-    def __create_project_file(self):
-        if not os.path.exists(self.__file_path):
-            f = open(self.__file_path, "x")
-            f.close()
-
-    def __get_datas(self):
-        f = open(self.__file_path, "r")
-        content = f.read()
-        f.close()
-
-        if len(content) == 0:
-            datas = {}
-        else:
-            datas = json.loads(content)
-        return datas
+            if os.name == "nt":
+                ctypes.windll.kernel32.SetFileAttributesW(self.__path_prefs, 0x02)
+
+    def __get_backend(self):
+        """
+        Get the backend, the SQLite database is created (and the JSON prefs migrated) at the first access
+        :return: backend
+        """
+        if self.__backend is None:
+            json_backend = JsonPrefsBackend(self.__file_path)
+            if self.__backend_name == BACKEND_SQLITE:
+                self.__create_folder_prefs()
+                self.__backend = SqlitePrefsBackend(self.__file_path + _SQLITE_EXTENSION, json_backend)
+            else:
+                self.__backend = json_backend
+        return self.__backend
+
+    def __write_changes(self, changes):
+        """
+        Write changes with a single write of the backend
+        :param changes: values by key (_REMOVED for the keys removed)
+        :return:
+        """
+        self.__create_folder_prefs()
+        values = {index: item for index, item in changes.items() if item is not _REMOVED}
+        removed_keys = [index for index, item in changes.items() if item is _REMOVED]
+        self.__get_backend().write(values, removed_keys)
+
+    @contextmanager
+    def batch(self):
+        """
+        Gather the changes made in the block and write them at once at the end :
+            with prefs.batch():
+                prefs["a"] = 1
+                prefs["b"] = 2
+        Nothing is written if the block raises an exception
+        :return:
+        """
+        if self.__batch_depth == 0:
+            self.__batch_changes = {}
+        self.__batch_depth += 1
+        try:
+            yield self
+            if self.__batch_depth == 1 and len(self.__batch_changes) > 0:
+                self.__write_changes(self.__batch_changes)
+        finally:
+            self.__batch_depth -= 1
+            if self.__batch_depth == 0:
+                self.__batch_changes = None
 
     def __contains__(self, item):
-        if not os.path.exists(self.__file_path):
-            return False
-        return item in self.__get_datas()
+        if self.__batch_changes is not None and item in self.__batch_changes:
+            return self.__batch_changes[item] is not _REMOVED
+        return self.__get_backend().contains(item)
 
     def __getitem__(self, index):
         index = str(index)
-        if not os.path.exists(self.__file_path):
-            raise IndexError(index + " doesn't exists in prefs")
-        datas = self.__get_datas()
-        if not index in datas:
+        if self.__batch_changes is not None and index in self.__batch_changes:
+            item = self.__batch_changes[index]
+        else:
+            item = self.__get_backend().get(index, _REMOVED)
+        if item is _REMOVED:
             raise IndexError(index + " doesn't exists in prefs")
-        return self.__get_datas()[index]
+        # The cached datas are shared, the caller gets its own copy of the containers
+        return copy.deepcopy(item) if isinstance(item, (dict, list)) else item
 
     def __setitem__(self, index, item):
-        self.__create_folder_prefs()
-        self.__create_project_file()
-
-        f = open(self.__file_path, "r+")
-        content = f.read()
-        if len(content) == 0:
-            datas = {}
+        changes = {str(index): copy.deepcopy(item)}
+        if self.__batch_changes is not None:
+            self.__batch_changes.update(changes)
         else:
-            datas = json.loads(content)
-        datas[str(index)] = item
-        f.seek(0)
-        f.truncate()
-        f.write(json.dumps(datas, indent=1))
-        f.close()
+            self.__write_changes(changes)
 
     def pop(self, index):
-        self.__create_folder_prefs()
-        self.__create_project_file()
-
-        f = open(self.__file_path, "r+")
-
-        content = f.read()
-        if len(content) == 0:
-            datas = {}
+        if index not in self:
+            return None
+        item = self[index]
+        if self.__batch_changes is not None:
+            self.__batch_changes[index] = _REMOVED
         else:
-            datas = json.loads(content)
-
-        item = None
-        if index in datas:
-            item = datas.pop(index)
-            f.seek(0)
-            f.truncate()
-            f.write(json.dumps(datas, indent=1))
-        f.close()
+            self.__write_changes({index: _REMOVED})
         return item
@@ -0,0 +1,174 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+
+from illogic.common.VersionList import VersionList
+from illogic.common.publish_scanner import stat_dir_mtime, scan_variant_names, scan_variant_versions
+
+# ######################################################################################################################
+
+_MAX_ASSETS = 4096
+_CHECK_INTERVAL = 2.0
+
+# ######################################################################################################################
+
+
+class PublishIndex:
+    def __init__(self, manifest_reader=None, max_assets=_MAX_ASSETS, check_interval=_CHECK_INTERVAL):
+        """
+        Constructor
+        :param manifest_reader: function(publish_ass_dir) returning the manifest written by the publish or None
+        :param max_assets: number of assets kept before the least recently used one is dropped
+        :param check_interval: seconds during which an entry is trusted without checking the directories mtimes
+        """
+        self.__manifest_reader = manifest_reader
+        self.__max_assets = max_assets
+        self.__check_interval = check_interval
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__store = None
+
+    def set_store(self, store):
+        """
+        Setter of the persistent store read when an asset is not in memory yet
+        :param store: PublishIndexStore or None
+        :return:
+        """
+        self.__store = store
+
+    def get(self, publish_ass_dir, dir_mtimes=None, stats=None):
+        """
+        Get the variants and versions of an asset, rescanning only the directories that changed
+        :param publish_ass_dir
+        :param dir_mtimes: dict filled with the mtime of each directory stat'ed
+        :param stats: dict filled with the number of syscalls done by kind ("scandir" and "stat")
+        :return: variants and versions
+        """
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__entries.get(publish_ass_dir)
+            if entry is not None:
+                self.__entries.move_to_end(publish_ass_dir)
+                if now - entry["checked"] < self.__check_interval:
+                    return entry["versions"]
+
+        if entry is None and self.__store is not None:
+            entry = self.__store.load(publish_ass_dir)
+        return self.__update(publish_ass_dir, entry, dir_mtimes, stats)["versions"]
+
+    def refresh(self, publish_ass_dir, dir_mtimes=None, stats=None):
+        """
+        Rescan an asset entirely and store the result
+        :param publish_ass_dir
+        :param dir_mtimes: dict filled with the mtime of each directory stat'ed
+        :param stats: dict filled with the number of syscalls done by kind ("scandir" and "stat")
+        :return: variants and versions
+        """
+        return self.__update(publish_ass_dir, None, dir_mtimes, stats)["versions"]
+
+    def invalidate(self, publish_ass_dir=None):
+        """
+        Drop an asset from the index or the whole index if no asset is given
+        :param publish_ass_dir
+        :return:
+        """
+        with self.__lock:
+            if publish_ass_dir is None:
+                self.__entries.clear()
+            else:
+                self.__entries.pop(publish_ass_dir, None)
+
+    def __contains__(self, publish_ass_dir):
+        with self.__lock:
+            return publish_ass_dir in self.__entries
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__entries)
+
+    def __update(self, publish_ass_dir, previous, dir_mtimes, stats):
+        """
+        Bring an entry up to date with the directories, only listing the ones whose mtime changed
+        :param publish_ass_dir
+        :param previous: previous entry or None
+        :param dir_mtimes
+        :param stats
+        :return: entry
+        """
+        # The mtimes are read before the listings so a change made during the scan is seen at the next check
+        asset_mtime = stat_dir_mtime(publish_ass_dir, dir_mtimes, stats)
+        previous_variants = previous["variants"] if previous is not None else {}
+
+        # The manifest replaces the listings of the directories that didn't change since it has been written
+        manifest_variants = {}
+        manifest_mtime = None
+        if (previous is None or previous["mtime"] != asset_mtime) and self.__manifest_reader is not None:
+            manifest = self.__manifest_reader(publish_ass_dir)
+            if manifest is not None:
+                manifest_variants = manifest["variants"]
+                manifest_mtime = manifest["mtime"]
+
+        if previous is not None and previous["mtime"] == asset_mtime:
+            variant_names = list(previous_variants.keys())
+        elif manifest_mtime is not None and manifest_mtime >= asset_mtime:
+            variant_names = list(manifest_variants.keys())
+        else:
+            variant_names = scan_variant_names(publish_ass_dir, stats)
+
+        variants = {}
+        changed = False
+        for variant_name in variant_names:
+            variant_dir = publish_ass_dir + "/" + variant_name
+            try:
+                variant_mtime = stat_dir_mtime(variant_dir, dir_mtimes, stats)
+            except OSError:
+                changed = True
+                continue
+            previous_variant = previous_variants.get(variant_name)
+            if previous_variant is not None and previous_variant[0] == variant_mtime:
+                variants[variant_name] = previous_variant
+                continue
+            if variant_name in manifest_variants and variant_mtime <= manifest_mtime:
+                variants[variant_name] = (variant_mtime, manifest_variants[variant_name]["versions"])
+            else:
+                variants[variant_name] = (variant_mtime, scan_variant_versions(variant_dir, stats))
+            changed = True
+        changed = changed or previous is None or previous["mtime"] != asset_mtime or \
+            len(variants) != len(previous_variants)
+
+        if changed or "versions" not in previous:
+            entry = {
+                "mtime": asset_mtime,
+                "variants": variants,
+                "versions": self.__build_versions(publish_ass_dir, variants),
+            }
+        else:
+            entry = previous
+        entry["checked"] = time.monotonic()
+
+        if changed and self.__store is not None:
+            self.__store.save(publish_ass_dir, asset_mtime, variants)
+
+        with self.__lock:
+            self.__entries[publish_ass_dir] = entry
+            self.__entries.move_to_end(publish_ass_dir)
+            while len(self.__entries) > self.__max_assets:
+                self.__entries.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def __build_versions(publish_ass_dir, variants):
+        """
+        Build the variants and versions table of an asset. It is immutable as it is shared by all the standins of
+        the asset, the version directories are derived from it when needed
+        :param publish_ass_dir
+        :param variants: mtime and versions of each variant directory
+        :return: read-only mapping of each variant to its VersionList
+        """
+        standin_versions = {}
+        for variant_name, (_, versions) in variants.items():
+            standin_versions[sys.intern(variant_name.split('_')[-1])] = \
+                VersionList([sys.intern(version) for version in versions])
+        return MappingProxyType(standin_versions)
@@ -0,0 +1,108 @@
+import json
+import sqlite3
+
+from illogic.common.SqliteConnection import SqliteConnection
+
+# ######################################################################################################################
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS asset (
+    asset_dir TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS variant (
+    asset_dir TEXT NOT NULL,
+    variant_name TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    versions TEXT NOT NULL,
+    PRIMARY KEY (asset_dir, variant_name)
+);
+"""
+
+# ######################################################################################################################
+
+
+class PublishIndexStore:
+    def __init__(self, db_path):
+        """
+        Constructor
+        :param db_path: path of the SQLite database shared by the Maya sessions
+        """
+        # The default rollback journal is kept because WAL doesn't work on network filesystems
+        self.__connection = SqliteConnection(db_path)
+        self.__connection.get().executescript(_SCHEMA)
+
+    def get_db_path(self):
+        """
+        Getter of the database path
+        :return: database path
+        """
+        return self.__connection.get_db_path()
+
+    def load(self, asset_dir):
+        """
+        Load an asset as it was last scanned by any session
+        :param asset_dir
+        :return: entry with the mtime of the asset directory and the mtime and versions of each variant or None
+        """
+        try:
+            with self.__connection.transaction() as connection:
+                row = connection.execute("SELECT mtime FROM asset WHERE asset_dir = ?", (asset_dir,)).fetchone()
+                variant_rows = connection.execute(
+                    "SELECT variant_name, mtime, versions FROM variant WHERE asset_dir = ?", (asset_dir,)).fetchall()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        variants = {}
+        for variant_name, mtime, versions in variant_rows:
+            variants[variant_name] = (mtime, json.loads(versions))
+        return {"mtime": row[0], "variants": variants}
+
+    def save(self, asset_dir, asset_mtime, variants):
+        """
+        Save an asset. A session that scanned an older state of the directories never overwrites a newer one
+        :param asset_dir
+        :param asset_mtime: mtime of the asset directory
+        :param variants: mtime and versions of each variant directory
+        :return: whether the asset has been saved
+        """
+        try:
+            with self.__connection.transaction(immediate=True) as connection:
+                row = connection.execute("SELECT mtime FROM asset WHERE asset_dir = ?", (asset_dir,)).fetchone()
+                if row is not None and row[0] > asset_mtime:
+                    return False
+                connection.execute("INSERT OR REPLACE INTO asset (asset_dir, mtime) VALUES (?, ?)",
+                                   (asset_dir, asset_mtime))
+                stored_mtimes = dict(connection.execute(
+                    "SELECT variant_name, mtime FROM variant WHERE asset_dir = ?", (asset_dir,)).fetchall())
+                for variant_name in stored_mtimes.keys() - variants.keys():
+                    connection.execute("DELETE FROM variant WHERE asset_dir = ? AND variant_name = ?",
+                                       (asset_dir, variant_name))
+                for variant_name, (mtime, versions) in variants.items():
+                    if stored_mtimes.get(variant_name, mtime) > mtime:
+                        continue
+                    connection.execute(
+                        "INSERT OR REPLACE INTO variant (asset_dir, variant_name, mtime, versions) VALUES (?, ?, ?, ?)",
+                        (asset_dir, variant_name, mtime, json.dumps(versions, separators=(",", ":"))))
+        except sqlite3.Error:
+            return False
+        return True
+
+    def clear(self, asset_dir=None):
+        """
+        Remove an asset from the store or every asset if no asset is given
+        :param asset_dir
+        :return: whether the store has been cleared
+        """
+        try:
+            with self.__connection.transaction(immediate=True) as connection:
+                if asset_dir is None:
+                    connection.execute("DELETE FROM variant")
+                    connection.execute("DELETE FROM asset")
+                else:
+                    connection.execute("DELETE FROM variant WHERE asset_dir = ?", (asset_dir,))
+                    connection.execute("DELETE FROM asset WHERE asset_dir = ?", (asset_dir,))
+        except sqlite3.Error:
+            return False
+        return True
@@ -0,0 +1,58 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# ######################################################################################################################
+
+_TIMEOUT = 30.0
+
+# ######################################################################################################################
+
+
+class SqliteConnection:
+    def __init__(self, db_path, timeout=_TIMEOUT):
+        """
+        Constructor. Opens a connection per thread to a SQLite database, on demand
+        :param db_path: path of the SQLite database
+        :param timeout: time waited for the lock of another session before failing
+        """
+        self.__db_path = db_path
+        self.__timeout = timeout
+        self.__local = threading.local()
+
+    def get_db_path(self):
+        """
+        Getter of the database path
+        :return: database path
+        """
+        return self.__db_path
+
+    def get(self):
+        """
+        Get the connection of the current thread (sqlite connections can't be shared between threads)
+        :return: connection
+        """
+        connection = getattr(self.__local, "connection", None)
+        if connection is None:
+            # Autocommit mode, the transactions are opened explicitly
+            connection = sqlite3.connect(self.__db_path, timeout=self.__timeout, isolation_level=None)
+            self.__local.connection = connection
+        return connection
+
+    @contextmanager
+    def transaction(self, immediate=False):
+        """
+        Run the block in a transaction of the connection of the current thread, committed at the end of the block or
+        rolled back if it raises
+        :param immediate: whether the write lock is taken immediately so concurrent writers wait instead of failing
+        halfway
+        :return: connection
+        """
+        connection = self.get()
+        connection.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
@@ -0,0 +1,135 @@
+import ctypes
+import json
+import os
+import sqlite3
+
+from illogic.common.SqliteConnection import SqliteConnection
+
+# ######################################################################################################################
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prefs (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_MIGRATED_KEY = "migrated_from"
+
+# Filesystems on which the shared memory index of WAL doesn't work
+_NETWORK_FS_TYPES = {"nfs", "nfs4", "cifs", "smbfs", "smb3", "afs", "9p", "fuse.sshfs", "lustre", "gpfs", "ceph"}
+_DRIVE_REMOTE = 4
+
+# ######################################################################################################################
+
+
+def _is_network_path(path):
+    """
+    Getter of whether a path is on a network filesystem
+    :param path
+    :return: is on a network filesystem
+    """
+    path = os.path.abspath(path)
+    if os.name == "nt":
+        if path.startswith("\\\\"):
+            return True
+        return ctypes.windll.kernel32.GetDriveTypeW(os.path.splitdrive(path)[0] + "\\") == _DRIVE_REMOTE
+    # The filesystem of the longest mount point containing the path
+    fs_type = None
+    mount_point_len = -1
+    try:
+        with open("/proc/mounts", "r") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point = fields[1].replace("\\040", " ")
+                if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) \
+                        and len(mount_point) > mount_point_len:
+                    fs_type = fields[2]
+                    mount_point_len = len(mount_point)
+    except OSError:
+        # No /proc (ex : macOS)
+        return False
+    return fs_type in _NETWORK_FS_TYPES
+
+
+class SqlitePrefsBackend:
+    def __init__(self, db_path, json_backend=None):
+        """
+        Constructor. Each key is a row so reading or writing a key doesn't load or rewrite the others
+        :param db_path: path of the SQLite database
+        :param json_backend: JsonPrefsBackend of the previous prefs file, its keys are imported on the first open
+        """
+        self.__connection = SqliteConnection(db_path)
+        connection = self.__connection.get()
+        # Unlike the publish index which lives on the shared storage, the prefs are usually on a local disk where WAL
+        # lets the sessions read while another one writes. The rollback journal is kept on a network home directory
+        if not _is_network_path(db_path):
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.OperationalError:
+                # WAL can't be set (ex : read only directory), the current journal mode is kept
+                pass
+        connection.executescript(_SCHEMA)
+        if json_backend is not None:
+            self.__migrate(json_backend)
+
+    def get_path(self):
+        """
+        Getter of the database path
+        :return: database path
+        """
+        return self.__connection.get_db_path()
+
+    def __migrate(self, json_backend):
+        """
+        Import the keys of a JSON prefs file once. The JSON file is left as it is
+        :param json_backend
+        :return:
+        """
+        with self.__connection.transaction(immediate=True) as connection:
+            row = connection.execute("SELECT value FROM meta WHERE key = ?", (_MIGRATED_KEY,)).fetchone()
+            if row is None:
+                try:
+                    datas = json_backend.get_datas()
+                except (OSError, ValueError):
+                    datas = None
+                if datas is not None:
+                    # The keys already in the database are newer than the JSON file
+                    connection.executemany("INSERT OR IGNORE INTO prefs (key, value) VALUES (?, ?)",
+                                           [(key, json.dumps(value, separators=(",", ":")))
+                                            for key, value in datas.items()])
+                connection.execute("INSERT INTO meta (key, value) VALUES (?, ?)",
+                                   (_MIGRATED_KEY, json_backend.get_path()))
+
+    def get_datas(self):
+        """
+        Get all the keys and values
+        :return: datas
+        """
+        rows = self.__connection.get().execute("SELECT key, value FROM prefs").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def contains(self, key):
+        return self.__connection.get().execute("SELECT 1 FROM prefs WHERE key = ?", (key,)).fetchone() is not None
+
+    def get(self, key, default=None):
+        row = self.__connection.get().execute("SELECT value FROM prefs WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else default
+
+    def write(self, values, removed_keys):
+        """
+        Set and remove keys in a single transaction
+        :param values: values set by key
+        :param removed_keys: keys removed
+        :return:
+        """
+        with self.__connection.transaction(immediate=True) as connection:
+            connection.executemany("DELETE FROM prefs WHERE key = ?", [(key,) for key in removed_keys])
+            connection.executemany("INSERT OR REPLACE INTO prefs (key, value) VALUES (?, ?)",
+                                   [(key, json.dumps(value, separators=(",", ":"))) for key, value in values.items()])
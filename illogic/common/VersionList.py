@@ -0,0 +1,73 @@
+import re
+from bisect import bisect_right
+from functools import lru_cache
+
+# ######################################################################################################################
+
+_KEY_CACHE_SIZE = 16384
+
+_NUMBER_PATTERN = re.compile(r"(\d+)")
+
+# ######################################################################################################################
+
+
+@lru_cache(maxsize=_KEY_CACHE_SIZE)
+def version_key(version):
+    """
+    Get the natural sort key of a version name, "v10" is newer than "v9" whatever the padding. Versions with the same
+    number but a different padding ("v010" and "v10") are ordered by their name so the order stays deterministic
+    :param version
+    :return: key
+    """
+    # The split alternates text and numbers so the keys of two versions always compare the same types
+    parts = _NUMBER_PATTERN.split(version)
+    return tuple(int(part) if i % 2 == 1 else part for i, part in enumerate(parts)), version
+
+
+class VersionList(tuple):
+    """
+    Immutable list of versions sorted from newest to oldest with their keys precomputed
+    """
+    def __new__(cls, versions):
+        """
+        Constructor
+        :param versions: version names in any order
+        """
+        keys_versions = sorted((version_key(version), version) for version in versions)
+        version_list = super().__new__(cls, [version for _, version in reversed(keys_versions)])
+        # Ascending keys for the bisections
+        version_list.__keys = [key for key, _ in keys_versions]
+        return version_list
+
+    def latest(self):
+        """
+        Getter of the newest version
+        :return: newest version or None if there is no version
+        """
+        return self[0] if len(self) > 0 else None
+
+    def count_newer(self, version):
+        """
+        Get the number of versions newer than the one given
+        :param version
+        :return: number of newer versions
+        """
+        return len(self.__keys) - bisect_right(self.__keys, version_key(version))
+
+    def has_newer(self, version):
+        """
+        Getter of whether a version newer than the one given exists
+        :param version
+        :return: has newer
+        """
+        return len(self) > 0 and version_key(self[0]) > version_key(version)
+
+    @staticmethod
+    def is_newer(version, other_version):
+        """
+        Getter of whether a version is newer than another one
+        :param version
+        :param other_version
+        :return: is newer
+        """
+        return version_key(version) > version_key(other_version)
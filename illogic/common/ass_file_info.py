@@ -0,0 +1,105 @@
+import mmap
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# ######################################################################################################################
+
+_INFO_WORKERS = 16
+# The header of an .ass file (comment lines written by the exporter) is in its first bytes
+_HEADER_MAX_SIZE = 8192
+_HEADER_PREFIX = b"###"
+
+# ######################################################################################################################
+
+# Size on disk and header of an .ass file. bounds is (xmin, ymin, zmin, xmax, ymax, zmax) or None
+AssFileInfo = namedtuple("AssFileInfo", ["size", "mtime", "bounds", "header"])
+
+# ######################################################################################################################
+
+# Infos by path, with the mtime and the size they were read at
+_INFO_CACHE = {}
+_INFO_CACHE_LOCK = threading.Lock()
+
+
+def __read_header(ass_path, size):
+    """
+    Read the comment lines at the top of an .ass file (### key: value) without reading the rest of the file
+    :param ass_path
+    :param size
+    :return: header values by key
+    """
+    header = {}
+    if size == 0:
+        return header
+    end = min(size, _HEADER_MAX_SIZE)
+    with open(ass_path, "rb") as f:
+        # Only the first bytes are mapped, the files can weigh several GB
+        with mmap.mmap(f.fileno(), end, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while pos < end and mm[pos:pos + len(_HEADER_PREFIX)] == _HEADER_PREFIX:
+                line_end = mm.find(b"\n", pos, end)
+                if line_end < 0:
+                    line_end = end
+                line = mm[pos + len(_HEADER_PREFIX):line_end].decode("utf-8", "replace")
+                key, sep, value = line.partition(":")
+                if sep:
+                    header[key.strip()] = value.strip()
+                pos = line_end + 1
+    return header
+
+
+def __parse_bounds(header):
+    try:
+        bounds = tuple(float(value) for value in header["bounds"].split())
+    except (KeyError, ValueError):
+        return None
+    return bounds if len(bounds) == 6 else None
+
+
+def get_ass_file_info(ass_path):
+    """
+    Get the size and the header of an .ass file. The header is only read again if the file changed
+    :param ass_path
+    :return: AssFileInfo or None if the file doesn't exist
+    """
+    try:
+        stat = os.stat(ass_path)
+    except OSError:
+        return None
+    with _INFO_CACHE_LOCK:
+        info = _INFO_CACHE.get(ass_path)
+    if info is not None and info.mtime == stat.st_mtime and info.size == stat.st_size:
+        return info
+    try:
+        header = __read_header(ass_path, stat.st_size)
+    except (OSError, ValueError):
+        header = {}
+    info = AssFileInfo(stat.st_size, stat.st_mtime, __parse_bounds(header), header)
+    with _INFO_CACHE_LOCK:
+        _INFO_CACHE[ass_path] = info
+    return info
+
+
+def get_ass_files_info(ass_paths, max_workers=_INFO_WORKERS):
+    """
+    Get the infos of many .ass files, each file is read once and in parallel
+    :param ass_paths
+    :param max_workers
+    :return: AssFileInfo (or None) by path
+    """
+    ass_paths = list(set(ass_paths))
+    if len(ass_paths) <= 1:
+        return {ass_path: get_ass_file_info(ass_path) for ass_path in ass_paths}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(ass_paths))) as executor:
+        return dict(zip(ass_paths, executor.map(get_ass_file_info, ass_paths)))
+
+
+def clear_ass_file_info_cache():
+    """
+    Forget all the infos read
+    :return:
+    """
+    with _INFO_CACHE_LOCK:
+        _INFO_CACHE.clear()
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import time
+
+# ######################################################################################################################
+
+# On Windows the file can't be replaced while another process is reading it
+_REPLACE_RETRIES = 5
+_REPLACE_RETRY_DELAY = 0.05
+
+# ######################################################################################################################
+
+
+def write_file_atomic(file_path, write):
+    """
+    Write a file through a temporary file of the same directory which then replaces it, so that a reader never sees a
+    partial file
+    :param file_path
+    :param write: function writing the content in the text file given
+    :return:
+    """
+    dir_path, file_name = os.path.split(file_path)
+    fd, tmp_path = tempfile.mkstemp(prefix=file_name + ".", dir=dir_path or os.curdir)
+    try:
+        with os.fdopen(fd, "w") as f:
+            write(f)
+        for retry in range(_REPLACE_RETRIES):
+            try:
+                os.replace(tmp_path, file_path)
+                break
+            except PermissionError:
+                if retry == _REPLACE_RETRIES - 1:
+                    raise
+                time.sleep(_REPLACE_RETRY_DELAY)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,187 @@
+import ast
+import importlib
+import os
+import sys
+import time
+
+# ######################################################################################################################
+
+# Offsets of the source mtime and size recorded in the header of a .pyc file
+_PYC_MTIME_OFFSET = 8
+_PYC_HEADER_SIZE = 16
+
+# ######################################################################################################################
+
+# (mtime, size) of the source of each module when it was last loaded
+_MODULE_STATS = {}
+# Intra-package imports of each module with the (mtime, size) of the source they were parsed from
+_MODULE_IMPORTS = {}
+
+# ######################################################################################################################
+
+
+def __get_source_stat(module):
+    file_path = getattr(module, "__file__", None)
+    if file_path is None or not file_path.endswith(".py"):
+        return None
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return int(stat.st_mtime), stat.st_size
+
+
+def __is_compiled_from(module, source_stat):
+    """
+    Check whether the cached bytecode of a module not loaded through the reloader is compiled from the current source
+    :param module
+    :param source_stat: (mtime, size) of the source
+    :return: is compiled from the source
+    """
+    cached_path = getattr(module, "__cached__", None)
+    if cached_path is None:
+        return False
+    try:
+        with open(cached_path, "rb") as f:
+            header = f.read(_PYC_HEADER_SIZE)
+    except OSError:
+        return False
+    if len(header) < _PYC_HEADER_SIZE:
+        return False
+    mtime = int.from_bytes(header[_PYC_MTIME_OFFSET:_PYC_MTIME_OFFSET + 4], "little")
+    size = int.from_bytes(header[_PYC_MTIME_OFFSET + 4:_PYC_HEADER_SIZE], "little")
+    return (mtime, size) == (source_stat[0] & 0xFFFFFFFF, source_stat[1] & 0xFFFFFFFF)
+
+
+def __parse_imports(module, source_stat, module_names):
+    """
+    Get the modules imported by a module among the modules given, the source is only parsed again when it changed
+    :param module
+    :param source_stat
+    :param module_names: names of the modules considered
+    :return: names of the modules imported
+    """
+    cached = _MODULE_IMPORTS.get(module.__name__)
+    if cached is not None and cached[0] == source_stat:
+        imported_names = cached[1]
+    else:
+        with open(module.__file__, "rb") as f:
+            tree = ast.parse(f.read(), module.__file__)
+        package = module.__name__ if hasattr(module, "__path__") else module.__name__.rpartition(".")[0]
+        imported_names = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imported_names.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level > 0:
+                    base = package.rsplit(".", node.level - 1)[0] if node.level > 1 else package
+                    from_name = base + "." + node.module if node.module else base
+                else:
+                    from_name = node.module
+                imported_names.add(from_name)
+                # "from package import module" imports the module
+                imported_names.update(from_name + "." + alias.name for alias in node.names)
+        imported_names = frozenset(imported_names)
+        _MODULE_IMPORTS[module.__name__] = (source_stat, imported_names)
+    dependencies = set()
+    for imported_name in imported_names:
+        # Importing a submodule runs its parent packages too
+        while imported_name:
+            if imported_name in module_names and imported_name != module.__name__:
+                dependencies.add(imported_name)
+            imported_name = imported_name.rpartition(".")[0]
+    return dependencies
+
+
+def __sort_dependencies_first(names, dependencies):
+    """
+    Sort modules so that each module comes after the modules it imports (the import cycles are broken arbitrarily)
+    :param names: names of the modules to sort
+    :param dependencies: names of the modules imported by module
+    :return: sorted names
+    """
+    sorted_names = []
+    visited = set()
+    for name in sorted(names):
+        if name in visited:
+            continue
+        visited.add(name)
+        stack = [(name, iter(sorted(dependencies[name] & names)))]
+        while len(stack) > 0:
+            current, it_dependencies = stack[-1]
+            dependency = next(it_dependencies, None)
+            if dependency is None:
+                stack.pop()
+                sorted_names.append(current)
+            elif dependency not in visited:
+                visited.add(dependency)
+                stack.append((dependency, iter(sorted(dependencies[dependency] & names))))
+    return sorted_names
+
+
+def reload_package(package, silent=True):
+    """
+    Reload the modules of a package that changed since they were loaded and the modules that depend on them, in
+    the order of their imports. The modules of the root package are considered (ex : "illogic" for
+    "illogic.asset_loader") so a change in a common module reloads the tools using it.
+    Nothing is reloaded if no file changed
+    :param package: name of the package (ex : "illogic.asset_loader")
+    :param silent: whether the modules reloaded and the time spent are printed
+    :return: names of the modules reloaded, time spent
+    """
+    start_time = time.time()
+    root_package = package.split(".")[0]
+    modules = {name: module for name, module in list(sys.modules.items())
+               if module is not None and (name == root_package or name.startswith(root_package + "."))
+               and name != __name__}
+
+    changed_names = set()
+    source_stats = {}
+    for name, module in modules.items():
+        source_stat = __get_source_stat(module)
+        if source_stat is None:
+            file_path = getattr(module, "__file__", None)
+            if file_path is not None and file_path.endswith(".py") and not os.path.exists(file_path):
+                # The source has been deleted
+                del sys.modules[name]
+            continue
+        source_stats[name] = source_stat
+        recorded_stat = _MODULE_STATS.get(name)
+        if recorded_stat is None:
+            if __is_compiled_from(module, source_stat):
+                _MODULE_STATS[name] = source_stat
+            else:
+                changed_names.add(name)
+        elif recorded_stat != source_stat:
+            changed_names.add(name)
+
+    reloaded_names = []
+    if len(changed_names) > 0:
+        module_names = set(source_stats.keys())
+        dependencies = {name: __parse_imports(modules[name], source_stats[name], module_names)
+                        for name in module_names}
+        dependents = {name: set() for name in module_names}
+        for name, module_dependencies in dependencies.items():
+            for dependency in module_dependencies:
+                dependents[dependency].add(name)
+
+        # The modules changed and all the modules importing them directly or not
+        names_to_reload = set(changed_names)
+        stack = list(changed_names)
+        while len(stack) > 0:
+            for dependent in dependents[stack.pop()]:
+                if dependent not in names_to_reload:
+                    names_to_reload.add(dependent)
+                    stack.append(dependent)
+
+        for name in __sort_dependencies_first(names_to_reload, dependencies):
+            importlib.reload(sys.modules[name])
+            _MODULE_STATS[name] = source_stats[name]
+            reloaded_names.append(name)
+
+    time_spent = time.time() - start_time
+    if not silent:
+        for name in reloaded_names:
+            print("Reloaded: %s" % name)
+        print("%d modules reloaded in %.3fs" % (len(reloaded_names), time_spent))
+    return reloaded_names, time_spent
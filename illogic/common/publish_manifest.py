@@ -0,0 +1,72 @@
+import json
+import os
+
+from illogic.common.VersionList import version_key
+from illogic.common.file_utils import write_file_atomic
+
+# ######################################################################################################################
+
+MANIFEST_FILE_NAME = ".publish_manifest.json"
+_MANIFEST_FORMAT = 1
+
+# ######################################################################################################################
+
+
+def get_manifest_path(publish_ass_dir):
+    return publish_ass_dir + "/" + MANIFEST_FILE_NAME
+
+
+def write_manifest(publish_ass_dir):
+    """
+    Write the manifest of an asset with its variants, versions (newest first), latest version and .ass file sizes.
+    To call by the publish step each time a version is published
+    :param publish_ass_dir
+    :return: manifest
+    """
+    variants = {}
+    with os.scandir(publish_ass_dir) as it_variants:
+        for variant_entry in it_variants:
+            if not variant_entry.is_dir():
+                continue
+            variant_dir = publish_ass_dir + "/" + variant_entry.name
+            with os.scandir(variant_dir) as it_versions:
+                versions = sorted([version_entry.name for version_entry in it_versions if version_entry.is_dir()],
+                                  key=version_key, reverse=True)
+            sizes = {}
+            for version in versions:
+                try:
+                    sizes[version] = os.stat(variant_dir + "/" + version + "/" + variant_entry.name + ".ass").st_size
+                except OSError:
+                    sizes[version] = None
+            variants[variant_entry.name] = {
+                "versions": versions,
+                "latest": versions[0] if len(versions) > 0 else None,
+                "sizes": sizes,
+            }
+
+    manifest = {"format": _MANIFEST_FORMAT, "variants": variants}
+    manifest_path = get_manifest_path(publish_ass_dir)
+    write_file_atomic(manifest_path, lambda f: json.dump(manifest, f, separators=(",", ":")))
+    # Renaming the file updated the mtime of the asset directory, the manifest must not look older than it
+    os.utime(manifest_path)
+    return manifest
+
+
+def read_manifest(publish_ass_dir):
+    """
+    Read the manifest of an asset. The caller compares "mtime" with the mtimes of the directories to know which parts
+    are stale : a directory modified after the manifest has been written must be listed again
+    :param publish_ass_dir
+    :return: manifest with its mtime or None if there is no valid manifest
+    """
+    manifest_path = get_manifest_path(publish_ass_dir)
+    try:
+        with open(manifest_path, "r") as f:
+            mtime = os.fstat(f.fileno()).st_mtime
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if type(manifest) is not dict or manifest.get("format") != _MANIFEST_FORMAT:
+        return None
+    manifest["mtime"] = mtime
+    return manifest
@@ -0,0 +1,55 @@
+import os
+
+# ######################################################################################################################
+
+# Every filesystem access of the publish index goes through these functions. They fill optional dicts :
+# - stats : number of syscalls done by kind ("scandir" and "stat")
+# - dir_mtimes : mtime of each directory stat'ed
+
+
+def __count(stats, kind):
+    if stats is not None:
+        stats[kind] = stats.get(kind, 0) + 1
+
+
+def stat_dir_mtime(dir_path, dir_mtimes=None, stats=None):
+    """
+    Get the mtime of a directory
+    :param dir_path
+    :param dir_mtimes
+    :param stats
+    :return: mtime
+    """
+    mtime = os.stat(dir_path).st_mtime
+    __count(stats, "stat")
+    if dir_mtimes is not None:
+        dir_mtimes[dir_path] = mtime
+    return mtime
+
+
+def scan_variant_names(publish_ass_dir, stats=None):
+    """
+    List the variant directories of an asset
+    :param publish_ass_dir
+    :param stats
+    :return: names of the variant directories
+    """
+    with os.scandir(publish_ass_dir) as it_variants:
+        variant_names = [variant_entry.name for variant_entry in it_variants if variant_entry.is_dir()]
+    __count(stats, "scandir")
+    return variant_names
+
+
+def scan_variant_versions(variant_dir, stats=None):
+    """
+    List the versions published in a variant directory.
+    The type of each entry comes from the directory listing itself so no stat is done per entry
+    (except on filesystems that don't report it, where os.DirEntry falls back to a stat).
+    :param variant_dir
+    :param stats
+    :return: versions
+    """
+    with os.scandir(variant_dir) as it_versions:
+        versions = [version_entry.name for version_entry in it_versions if version_entry.is_dir()]
+    __count(stats, "scandir")
+    return versions
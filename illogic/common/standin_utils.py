@@ -1,54 +1,176 @@
 import os
 import re
+import sqlite3
+import sys
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-try:
-    import pymel.core as pm
-except:
-    # Maya not found
-    pass
+from illogic.common.PublishIndex import PublishIndex
+from illogic.common.PublishIndexStore import PublishIndexStore
+from illogic.common.publish_manifest import read_manifest
+from illogic.common.LodTierTable import LodTierTable, DEFAULT_LOD_TIERS
+
+# ######################################################################################################################
+
+_PREFETCH_WORKERS = 16
+_PUBLISH_INDEX_DB_ENV = "ILLOGIC_PUBLISH_INDEX_DB"
+_PARSE_CACHE_SIZE = 16384
+
+_ASS_FILE_PATTERN = re.compile(r".*\.ass")
+
+# ######################################################################################################################
+
+# Structure of a standin file path : <publish_ass_dir>/<standin_name>_<variant>/<version>/<standin_name>_<variant>.ass
+StandinPath = namedtuple("StandinPath", ["standin_name", "publish_ass_dir", "active_variant", "active_version"])
+
+# ######################################################################################################################
+
+
+# Process-wide index of the publish directories already scanned
+_PUBLISH_INDEX = PublishIndex(read_manifest)
+
+
+def __create_store(db_path):
+    """
+    Open the persistent index, the publish directories are only indexed in memory if its database can't be opened
+    :param db_path
+    :return: PublishIndexStore or None
+    """
+    if db_path is None:
+        return None
+    try:
+        return PublishIndexStore(db_path)
+    except sqlite3.Error as e:
+        print("Publish index database %s can't be opened : %s" % (db_path, e))
+        return None
+
+
+# Persistent index shared by the Maya sessions, enabled by giving the path of its database
+if _PUBLISH_INDEX_DB_ENV in os.environ:
+    _PUBLISH_INDEX.set_store(__create_store(os.environ[_PUBLISH_INDEX_DB_ENV]))
+
+
+def set_publish_index_store(db_path):
+    _PUBLISH_INDEX.set_store(__create_store(db_path))
+
+
+def get_standin_versions(publish_ass_dir, dir_mtimes=None, stats=None):
+    # Shared read-only table {variant: VersionList} with the versions sorted from newest to oldest
+    return _PUBLISH_INDEX.get(publish_ass_dir, dir_mtimes, stats)
+
+
+def get_version_dir(publish_ass_dir, standin_name, variant, version):
+    return publish_ass_dir + "/" + standin_name + "_" + variant + "/" + version
+
+
+def get_version_file(publish_ass_dir, standin_name, variant, version):
+    return get_version_dir(publish_ass_dir, standin_name, variant, version) + "/" + standin_name + "_" + variant + ".ass"
 
-def parse_standin(standin):
-    standin_trsf = standin.getParent()
-    trsf_name = standin_trsf.name()
-    object_name = trsf_name
+
+def refresh_publish_index(publish_ass_dir, dir_mtimes=None, stats=None):
+    return _PUBLISH_INDEX.refresh(publish_ass_dir, dir_mtimes, stats)
+
+
+def invalidate_publish_index(publish_ass_dir=None):
+    _PUBLISH_INDEX.invalidate(publish_ass_dir)
+
+
+# Tier table of each asset with the version table it has been built from
+_LOD_TIER_TABLES = {}
+_LOD_TIERS = DEFAULT_LOD_TIERS
+
+
+def set_lod_tiers(tiers):
+    """
+    Set the tier tokens recognized in the variant names (ex : ["proxy", "SD", "HD"])
+    :param tiers
+    :return:
+    """
+    global _LOD_TIERS
+    _LOD_TIERS = tuple(tiers)
+    _LOD_TIER_TABLES.clear()
+
+
+def get_lod_tiers():
+    return _LOD_TIERS
+
+
+def get_lod_tier_table(publish_ass_dir, versions):
+    """
+    Get the tier table of an asset, it is only built again for another version table of the asset. No file I/O
+    :param publish_ass_dir
+    :param versions: variants and versions of the asset given by the publish index
+    :return: LodTierTable
+    """
+    cached = _LOD_TIER_TABLES.get(publish_ass_dir)
+    if cached is not None and cached[0] is versions:
+        return cached[1]
+    lod_tier_table = LodTierTable(versions, _LOD_TIERS)
+    _LOD_TIER_TABLES[publish_ass_dir] = (versions, lod_tier_table)
+    return lod_tier_table
+
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def parse_standin_path(standin_file_path):
+    """
+    Parse the path of a standin file. Pure and memoized so the standins sharing a file parse it once
+    :param standin_file_path
+    :return: StandinPath or None if the path is not a .ass file
+    """
+    if not standin_file_path or not _ASS_FILE_PATTERN.match(standin_file_path):
+        return None
+    path_version_dir, standin_file_name_ext = os.path.split(standin_file_path)
+    path_variant_dir, active_version = os.path.split(path_version_dir)
+    publish_ass_dir, variant = os.path.split(path_variant_dir)
 
     # standin name
-    standin_file_path = standin.dso.get()
-    if not re.match(r".*\.ass", standin_file_path):
-        return {"valid": False, "object_name": object_name}
-    standin_file_name_ext = os.path.basename(standin_file_path)
     standin_file_name = os.path.splitext(standin_file_name_ext)[0]
-    standin_name = re.sub("_" + standin_file_name.split('_')[-1], '', standin_file_name)
+    standin_name = standin_file_name.replace("_" + standin_file_name.split('_')[-1], '')
+
+    return StandinPath(sys.intern(standin_name), sys.intern(publish_ass_dir),
+                       sys.intern(variant.split('_')[-1]), sys.intern(active_version))
+
 
-    # active variant and version
-    path_version_dir = os.path.dirname(standin_file_path)
-    path_variant_dir = os.path.dirname(path_version_dir)
-    publish_ass_dir = os.path.dirname(path_variant_dir)
-    variant = os.path.basename(path_variant_dir)
-    active_variant = variant.split('_')[-1]
-    active_version = os.path.basename(path_version_dir)
+def prefetch_publish_dirs(publish_ass_dirs, max_workers=_PREFETCH_WORKERS):
+    """
+    Scan in parallel the publish directories given to warm the publish index
+    :param publish_ass_dirs
+    :param max_workers: number of threads listing the directories
+    :return:
+    """
+    publish_ass_dirs = set(publish_ass_dirs)
+    if len(publish_ass_dirs) == 0:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(publish_ass_dirs))) as executor:
+        futures = [executor.submit(get_standin_versions, publish_ass_dir) for publish_ass_dir in publish_ass_dirs]
+        for future in futures:
+            try:
+                future.result()
+            except OSError:
+                # The error will be raised again when the standin is parsed
+                pass
+
+
+def parse_standin(standin):
+    object_name = standin.getParent().name()
+    standin_path = parse_standin_path(standin.dso.get())
+    if standin_path is None:
+        return {"valid": False, "object_name": object_name}
 
-    # variants and versions
     standin_versions = {}
-    path_asset_dir = os.path.dirname(path_variant_dir)
-    for variant in os.listdir(path_asset_dir):
-        variant_dir = path_asset_dir + "/" + variant
-        if os.path.isdir(variant_dir):
-            standin_versions[variant.split('_')[-1]] = []
-            for version in os.listdir(variant_dir):
-                version_dir = variant_dir + "/" + version
-                if os.path.isdir(version_dir):
-                    standin_versions[variant.split('_')[-1]].append((version, version_dir))
-
-    for variant in standin_versions.keys():
-        standin_versions[variant] = sorted(standin_versions[variant], reverse=True)
+    for variant, versions in get_standin_versions(standin_path.publish_ass_dir).items():
+        standin_versions[variant] = [
+            (version, get_version_dir(standin_path.publish_ass_dir, standin_path.standin_name, variant, version))
+            for version in versions]
 
     return {
         "valid": True,
         "object_name": object_name,
-        "standin_name": standin_name,
-        "publish_ass_dir": publish_ass_dir,
-        "active_variant": active_variant,
-        "active_version": active_version,
+        "standin_name": standin_path.standin_name,
+        "publish_ass_dir": standin_path.publish_ass_dir,
+        "active_variant": standin_path.active_variant,
+        "active_version": standin_path.active_version,
         "standin_versions": standin_versions,
-    }
\ No newline at end of file
+    }
@@ -7,6 +7,13 @@ except:
     # Maya not found
     pass
 
+# ######################################################################################################################
+
+# Marks the end of the items of a container in iter_var
+_END_OF_ITEMS = object()
+
+# ######################################################################################################################
+
 
 # Clear a layout recusrively
 def clear_layout(layout):
@@ -49,48 +56,108 @@ def __get_val(v):
         return str(v)
 
 
-def print_var(*vs, empty_tab=False):
+def print_var(*vs, empty_tab=False, stream=None, max_depth=None, max_items=None):
+    """
+    Print a variable with its nested dicts, lists and tuples indented
+    :param vs: variable (or variables printed as a tuple)
+    :param empty_tab: whether the indentation is a bare tab instead of "`\t"
+    :param stream: text stream written to, sys.stdout if None
+    :param max_depth: depth of the containers beyond which they are elided
+    :param max_items: number of items printed by container
+    :return:
+    """
     vs = vs[0] if len(vs) == 1 else vs
     tabulation = "\t" if empty_tab else "`\t"
-    print(__print_var_aux(vs, tabulation))
-
-
-def __print_var_aux(v, tabulation, tabs=0, v_in_dict=False):
-    str_msg = ""
-    if type(v) is dict:
-        if len(v) == 0:
-            str_msg += "{}\n"
+    write_var(vs, stream, tabulation, max_depth, max_items)
+    (stream if stream is not None else sys.stdout).write("\n")
+
+
+def write_var(v, stream=None, tabulation="`\t", max_depth=None, max_items=None):
+    """
+    Write a variable to a text stream chunk by chunk
+    :param v
+    :param stream: text stream written to, sys.stdout if None
+    :param tabulation
+    :param max_depth: depth of the containers beyond which they are elided
+    :param max_items: number of items written by container
+    :return:
+    """
+    if stream is None:
+        stream = sys.stdout
+    for chunk in iter_var(v, tabulation, max_depth, max_items):
+        stream.write(chunk)
+
+
+def iter_var(v, tabulation="`\t", max_depth=None, max_items=None):
+    """
+    Generate the lines of the display of a variable. The containers are walked with an explicit stack so there is no
+    recursion limit, a container inside itself is displayed as a recursion marker
+    :param v
+    :param tabulation
+    :param max_depth: depth of the containers beyond which they are elided
+    :param max_items: number of items generated by container
+    :return: chunks of text
+    """
+    # Frames of the containers being displayed : [items iterator, tabs, is dict, closing line, id, count, length]
+    stack = []
+    ancestors = set()
+    # Next value to display : prefix, value, tabs, whether it is a value of a dict
+    pending = ("", v, 0, False)
+    while True:
+        if pending is not None:
+            prefix, value, tabs, v_in_dict = pending
+            pending = None
+            yield prefix
+            tabs_str = "" if v_in_dict else tabs * tabulation
+            if type(value) is dict or type(value) is list or type(value) is tuple:
+                if type(value) is dict:
+                    char_start, char_end = "{", "}"
+                elif type(value) is list:
+                    char_start, char_end = "[", "]"
+                else:
+                    char_start, char_end = "(", ")"
+                if len(value) == 0:
+                    yield char_start + char_end + "\n"
+                elif id(value) in ancestors:
+                    yield tabs_str + "<Recursion on " + type(value).__name__ + ">\n"
+                elif max_depth is not None and len(stack) >= max_depth:
+                    yield tabs_str + char_start + "..." + char_end + "\n"
+                else:
+                    if v_in_dict:
+                        yield "\n"
+                    yield tabs * tabulation + char_start + "\n"
+                    ancestors.add(id(value))
+                    items = iter(value.items()) if type(value) is dict else iter(value)
+                    stack.append([items, tabs, type(value) is dict, tabs * tabulation + char_end + "\n", id(value), 0,
+                                  len(value)])
+            else:
+                try:
+                    yield tabs_str + __get_val(value) + "\n"
+                except:
+                    yield tabs_str + "Unknown value" + "\n"
+            continue
+
+        if len(stack) == 0:
+            return
+        frame = stack[-1]
+        items, tabs, is_dict, closing, value_id, count, length = frame
+        if max_items is not None and count >= max_items:
+            if count < length:
+                yield (tabs + 1) * tabulation + "... (" + str(length - count) + " more items)\n"
+            item = _END_OF_ITEMS
         else:
-            if v_in_dict:
-                str_msg += "\n"
-            str_msg += tabs * tabulation + "{\n"
-            for key, elems in v.items():
-                str_msg += (tabs + 1) * tabulation + __get_val(key) + " : "
-                str_msg += __print_var_aux(elems, tabulation, tabs + 1, True)
-            str_msg += tabs * tabulation + "}\n"
-    elif type(v) is list or type(v) is tuple:
-        if type(v) is list:
-            char_start = "["
-            char_end = "]"
+            item = next(items, _END_OF_ITEMS)
+        if item is _END_OF_ITEMS:
+            stack.pop()
+            ancestors.discard(value_id)
+            yield closing
+            continue
+        frame[5] += 1
+        if is_dict:
+            key, elem = item
+            pending = ((tabs + 1) * tabulation + __get_val(key) + " : ", elem, tabs + 1, True)
         else:
-            char_start = "("
-            char_end = ")"
-        if len(v) == 0:
-            str_msg += char_start + char_end + "\n"
-        else:
-            if v_in_dict:
-                str_msg += "\n"
-            str_msg += tabs * tabulation + char_start + "\n"
-            for elem_list in v:
-                str_msg += __print_var_aux(elem_list, tabulation, tabs + 1, False)
-            str_msg += tabs * tabulation + char_end + "\n"
-    else:
-        tabs_str = "" if v_in_dict else tabs * tabulation
-        try:
-            str_msg += tabs_str + __get_val(v) + "\n"
-        except:
-            str_msg += tabs_str + "Unknown value" + "\n"
-    return str_msg
+            pending = ("", item, tabs + 1, False)
 
 
 def print_warning(msg, char_filler='-'):
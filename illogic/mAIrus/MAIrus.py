@@ -126,11 +126,12 @@ class MAIrus(QDialog):
         Save preferences
         :return:
         """
-        size = self.size()
-        self.__prefs["window_size"] = {"width": size.width(), "height": size.height()}
-        pos = self.pos()
-        self.__prefs["window_pos"] = {"x": pos.x(), "y": pos.y()}
-        self.__prefs["model"] = self.__model.get_model_name()
+        with self.__prefs.batch():
+            size = self.size()
+            self.__prefs["window_size"] = {"width": size.width(), "height": size.height()}
+            pos = self.pos()
+            self.__prefs["window_pos"] = {"x": pos.x(), "y": pos.y()}
+            self.__prefs["model"] = self.__model.get_model_name()
 
     def __retrieve_prefs(self):
         """
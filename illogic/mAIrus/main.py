@@ -1,7 +1,7 @@
 """mAIrus - A tool for generating text using OpenAI's GPT-3 API"""
 
 import importlib
-from illogic.common import utils
+from illogic.common.module_reloader import reload_package
 
 
 
@@ -13,7 +13,7 @@ __PATH_TO_OPENAI_KEY = 'PATH/TO/openai_key'
 
 # ##################################################################################################################
 if __name__ == "__main__":
-    utils.unload_packages(silent=True, package="illogic.mAIrus")
+    reload_package("illogic.mAIrus", silent=False)
     importlib.import_module("illogic.mAIrus.MAIrus")
     from mAIrus.MAIrus import MAIrus
     try:
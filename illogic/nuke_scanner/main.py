@@ -1,7 +1,7 @@
 import importlib
-from illogic.common import utils
+from illogic.common.module_reloader import reload_package
 
-utils.unload_packages(silent=True, package="illogic.nuke_scanner")
+reload_package("illogic.nuke_scanner", silent=False)
 importlib.import_module("illogic.nuke_scanner")
 from nuke_scanner.NukeScanner import NukeScanner
 NukeScanner().run()
\ No newline at end of file